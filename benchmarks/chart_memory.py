@@ -0,0 +1,85 @@
+import argparse
+import gc
+import os
+import sys
+from io import BytesIO
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from faculty import charts  # noqa: E402
+
+##############################################
+# Chart memory: pyplot state machine vs faculty.charts
+#
+# Draws the Student Grade Analytics grade-count chart N times with fresh
+# data each time (so nothing is served from the cache) and prints resident
+# memory as it goes. The pyplot variant is the old render_bar_graph_*
+# code: plt.figure() without plt.close(), so every figure stays in
+# pyplot's registry.
+#
+#   python -m benchmarks.chart_memory [--renders 100]
+##############################################
+
+
+def rss_mib():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # peak, not current
+
+
+def pyplot_chart(grades, title):
+    counts = grades.value_counts().reset_index()
+    counts.columns = ['Grade', 'count']
+    plt.figure(figsize=(8, 4))
+    bars = plt.bar(counts['Grade'], counts['count'], color='#1976d2')
+    for bar in bars:
+        height = bar.get_height()
+        plt.text(bar.get_x() + bar.get_width()/2, height + 0.1, str(height),
+                 ha='center', va='bottom', fontsize=8, fontweight='regular')
+    plt.xlabel('Grade')
+    plt.ylabel('Frequency')
+    plt.title(title)
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    plt.tight_layout()
+    plt.savefig(BytesIO(), format="png", dpi=charts.DPI, bbox_inches="tight")  # what st.pyplot(plt) did
+
+
+def run(label, draw, renders, rng):
+    gc.collect()
+    start = rss_mib()
+    marks = []
+    for i in range(renders):
+        grades = pd.Series(rng.integers(60, 100, size=40), name="Grade")
+        draw(grades, f"Grade Distribution for run {i}")
+        if (i + 1) % max(renders // 5, 1) == 0:
+            gc.collect()
+            marks.append(rss_mib())
+    print(f"{label:<16} start {start:7.1f} MiB  " + "  ".join(f"{m:7.1f}" for m in marks)
+          + f"  (+{marks[-1] - start:.1f} MiB)")
+    return marks[-1] - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare chart rendering memory growth.")
+    parser.add_argument("--renders", type=int, default=100, help="charts to draw per variant")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    # warm up fonts and the Agg renderer so neither variant pays for them
+    charts.draw(charts.grade_counts_chart, pd.Series([75, 80]), "warm-up")
+
+    grown = run("faculty.charts", lambda g, t: charts.draw(charts.grade_counts_chart, g, t), args.renders, rng)
+    leaked = run("pyplot", pyplot_chart, args.renders, rng)
+    print(f"\nopen pyplot figures: {len(plt.get_fignums())}; growth {leaked:.1f} MiB vs {grown:.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from faculty.db import get_database
+from faculty.gpa import DEFAULT_POINTS, GPA_SCALE, gpa_points
+from faculty.progress import student_progress
+
+##############################################
+# GPA conversion: Python loop vs NumPy, server vs client tracker
+#
+# The micro-benchmark needs no database; the tracker comparison runs the
+# Student ID tracker both ways for a sample of students.
+#
+#   python -m benchmarks.gpa_strategies --micro [--grades 1000000]
+#   python -m benchmarks.gpa_strategies [--students 20] [--runs 3]
+##############################################
+
+
+def loop_points(grades):
+    # Row-at-a-time equivalent of the $switch, as the baseline
+    out = []
+    for grade in grades:
+        points = DEFAULT_POINTS
+        if grade == grade:  # skip NaN
+            for minimum, p in GPA_SCALE:
+                if grade >= minimum:
+                    points = p
+                    break
+        out.append(points)
+    return out
+
+
+def best_of(fn, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def micro(n, runs):
+    rng = np.random.default_rng(0)
+    grades = rng.uniform(50, 100, n).round(1)
+    grades[rng.random(n) < 0.05] = np.nan
+
+    assert np.array_equal(gpa_points(grades), np.array(loop_points(grades)))
+
+    loop = best_of(lambda: loop_points(grades), max(1, runs // 3))
+    vectorized = best_of(lambda: gpa_points(grades), runs)
+    print(f"{n:,} grades")
+    print(f"  python loop    {loop * 1000:>10.1f} ms")
+    print(f"  searchsorted   {vectorized * 1000:>10.1f} ms  ({loop / vectorized:,.0f}x)")
+
+
+def compare_tracker(db, student_ids, runs):
+    timings = {"server": [], "client": []}
+    for student_id in student_ids:
+        for mode in timings:
+            timings[mode].append(best_of(lambda: student_progress(db, student_id, mode), runs))
+
+        server = student_progress(db, student_id, "server").sort_values(["SemesterID", "SubjectCode"])
+        client = student_progress(db, student_id, "client")
+        if not np.allclose(server["SemesterGPA"].to_numpy(dtype=float),
+                           client["SemesterGPA"].to_numpy(dtype=float), equal_nan=True):
+            print(f"❌ SemesterGPA differs for student {student_id}")
+            return 1
+
+    print(f"{len(student_ids)} students, best of {runs} runs each")
+    for mode, values in timings.items():
+        print(f"  {mode:<7} p50 {statistics.median(values) * 1000:>8.1f} ms   "
+              f"max {max(values) * 1000:>8.1f} ms")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare GPA evaluation strategies.")
+    parser.add_argument("--uri", help="MongoDB URI (defaults to MONGODB_URI)")
+    parser.add_argument("--micro", action="store_true", help="run the in-memory conversion benchmark only")
+    parser.add_argument("--grades", type=int, default=1_000_000)
+    parser.add_argument("--students", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.micro:
+        micro(args.grades, args.runs)
+        return 0
+
+    db = get_database(args.uri)
+    student_ids = db["new_grades"].distinct("StudentID")[:args.students]
+    if not student_ids:
+        print("❌ new_grades is empty")
+        return 1
+    return compare_tracker(db, student_ids, args.runs)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
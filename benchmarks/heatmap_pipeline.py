@@ -0,0 +1,111 @@
+import argparse
+import statistics
+import sys
+import time
+
+from faculty.db import get_database
+from faculty.pipelines import subject_difficulty_pipeline
+
+##############################################
+# Subject Difficulty Heatmap: triple $unwind vs $zip
+#
+# Counts the documents flowing out of every stage of both pipelines (by
+# re-running each prefix with a trailing $count) and times the full runs.
+#
+#   python -m benchmarks.heatmap_pipeline [--teacher NAME] [--runs 5]
+#   python -m benchmarks.heatmap_pipeline --estimate --docs 1000 --subjects 8
+##############################################
+
+
+def legacy_subject_difficulty_pipeline(teacher_name):
+    # The pre-$zip pipeline, kept here as the baseline
+    return [
+        {"$match": {"Teachers": teacher_name}},
+        {"$unwind": {"path": "$SubjectCodes", "includeArrayIndex": "idx"}},
+        {"$unwind": {"path": "$Grades", "includeArrayIndex": "gidx"}},
+        {"$unwind": {"path": "$Teachers", "includeArrayIndex": "tidx"}},
+        {"$match": {"$expr": {"$eq": ["$idx", "$tidx"]}}},
+        {"$match": {"$expr": {"$eq": ["$idx", "$gidx"]}}},
+        {"$match": {"Teachers": teacher_name}},
+        {"$project": {
+            "_id": 0,
+            "StudentID": 1,
+            "CourseCode": "$SubjectCodes",
+            "Grade": "$Grades",
+            "Teacher": "$Teachers"
+        }}
+    ]
+
+
+def stage_counts(collection, pipeline):
+    counts = []
+    for k in range(1, len(pipeline) + 1):
+        result = list(collection.aggregate(pipeline[:k] + [{"$count": "n"}], allowDiskUse=True))
+        counts.append((next(iter(pipeline[k - 1])), result[0]["n"] if result else 0))
+    return counts
+
+
+def time_pipeline(collection, pipeline, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        rows = len(list(collection.aggregate(pipeline, allowDiskUse=True)))
+        timings.append(time.perf_counter() - started)
+    return rows, statistics.median(timings)
+
+
+def estimate(docs, subjects, teacher_share):
+    # Intermediate documents for `docs` matched grade documents with
+    # `subjects` entries each, `teacher_share` of which belong to the teacher
+    unwind = docs * (subjects + subjects ** 2 + subjects ** 3)
+    zipped = docs * subjects * teacher_share
+    return unwind, zipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the heatmap pipelines.")
+    parser.add_argument("--uri", help="MongoDB URI (defaults to MONGODB_URI)")
+    parser.add_argument("--teacher", help="teacher to benchmark (defaults to one found in new_grades)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--estimate", action="store_true", help="print the analytic blow-up only")
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--subjects", type=int, default=8)
+    parser.add_argument("--teacher-share", type=float, default=0.125)
+    args = parser.parse_args(argv)
+
+    if args.estimate:
+        unwind, zipped = estimate(args.docs, args.subjects, args.teacher_share)
+        print(f"triple $unwind: {unwind:,} intermediate documents")
+        print(f"$zip + $filter: {zipped:,.0f} intermediate documents")
+        print(f"ratio:          {unwind / max(zipped, 1):,.0f}x")
+        return 0
+
+    grades = get_database(args.uri)["new_grades"]
+    teacher = args.teacher
+    if teacher is None:
+        doc = grades.find_one({"Teachers.0": {"$exists": True}}, {"Teachers": 1})
+        if doc is None:
+            print("❌ new_grades is empty")
+            return 1
+        teacher = doc["Teachers"][0]
+
+    totals = {}
+    for label, build in (("triple $unwind", legacy_subject_difficulty_pipeline),
+                         ("$zip + $filter", subject_difficulty_pipeline)):
+        pipeline = build(teacher)
+        counts = stage_counts(grades, pipeline)
+        rows, seconds = time_pipeline(grades, pipeline, args.runs)
+        totals[label] = sum(n for _, n in counts)
+
+        print(f"\n{label}  ({rows} rows, median {seconds * 1000:.1f} ms over {args.runs} runs)")
+        for i, (stage, n) in enumerate(counts, start=1):
+            print(f"  {i:>2}. {stage:<10} {n:>12,}")
+        print(f"      total      {totals[label]:>12,}")
+
+    before, after = totals["triple $unwind"], totals["$zip + $filter"]
+    print(f"\nintermediate documents: {before:,} -> {after:,} ({before / max(after, 1):,.1f}x fewer)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
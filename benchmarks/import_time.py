@@ -0,0 +1,92 @@
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+##############################################
+# Cold-start import time
+#
+# Runs app.py's top-level imports in a fresh interpreter under
+# `python -X importtime` and reports the total, the heaviest top-level
+# packages, and whether any package that should only load on demand
+# (reportlab, matplotlib) was pulled in. With --budget-ms, or whenever a
+# deferred package shows up, it exits 1, so it can gate a deploy; --json
+# writes the numbers for tracking over time.
+#
+#   python -m benchmarks.import_time [--runs 5] [--budget-ms 2500] [--json out.json]
+##############################################
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+DEFERRED = ("reportlab", "matplotlib")
+
+
+def app_imports(path=APP):
+    # The import statements at app.py's top level, as source
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(node) for node in nodes)
+
+
+def measure(code):
+    # ({package: cumulative us} for top-level imports, every module loaded, total us)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=os.path.dirname(APP), capture_output=True, text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    packages, modules, total = {}, set(), 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total += int(self_us)
+        modules.add(name.strip())
+        if not name[1:].startswith(" "):   # no extra indent: imported from the top
+            packages[name.strip()] = int(cumulative_us)
+    return packages, modules, total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure app.py's cold-start import time.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time (median is reported)")
+    parser.add_argument("--top", type=int, default=10, help="heaviest packages to list")
+    parser.add_argument("--budget-ms", type=float, help="fail when the median total exceeds this")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    code = app_imports()
+    measure(code)  # compile .pyc files first
+    runs = [measure(code) for _ in range(args.runs)]
+    total_ms = statistics.median(total for _, _, total in runs) / 1000
+    packages = {name: statistics.median(run.get(name, 0) for run, _, _ in runs) / 1000 for name in runs[0][0]}
+    loaded = sorted({name.split(".")[0] for _, modules, _ in runs for name in modules} & set(DEFERRED))
+
+    print(f"app.py imports: {total_ms:,.0f} ms (median of {args.runs})")
+    for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<32} {ms:>8,.1f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"total_ms": round(total_ms, 1), "runs": args.runs, "deferred_loaded": loaded,
+                       "packages_ms": {name: round(ms, 1) for name, ms in packages.items()}}, f, indent=2)
+
+    failed = False
+    if loaded:
+        print(f"❌ loaded at startup: {', '.join(loaded)}")
+        failed = True
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"❌ over budget: {total_ms:,.0f} ms > {args.budget_ms:,.0f} ms")
+        failed = True
+    if not failed:
+        print("✅ no deferred packages loaded at startup")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import argparse
+import io
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from faculty.pdf import generate_pdf_intervention
+
+##############################################
+# Intervention list PDF: per-row setStyle vs the shared renderer
+#
+# Builds a synthetic intervention list and times the previous generator
+# (one Table, one setStyle per striped row) against faculty.pdf.
+#
+#   python -m benchmarks.pdf_tables [--rows 1000 5000 10000] [--skip-legacy-above 5000]
+##############################################
+
+
+def legacy_generate_pdf_intervention(df, teacher_name):
+    # The pre-renderer generator, kept here as the baseline
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer, pagesize=A4,
+        leftMargin=30, rightMargin=30, topMargin=30, bottomMargin=30
+    )
+
+    elements = []
+    styles = getSampleStyleSheet()
+    elements.append(Paragraph("Intervention Candidates List", styles["Heading1"]))
+    elements.append(Paragraph(f"Student Performance For {teacher_name}", styles["Heading3"]))
+    elements.append(Spacer(1, 12))
+
+    data = [df.columns.tolist()] + df.values.tolist()
+    col_widths = [50, 100, 80, 100, 50, 50, 100]
+
+    table = Table(data, repeatRows=1, colWidths=col_widths)
+    table.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1976d2")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica"),
+        ("FONTSIZE", (0, 1), (-1, -1), 8),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 9),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+    ]))
+
+    # Zebra striping
+    for i in range(1, len(data)):
+        if i % 2 == 0:
+            table.setStyle(TableStyle([
+                ("BACKGROUND", (0, i), (-1, i), colors.whitesmoke)
+            ]))
+
+    elements.append(table)
+    doc.build(elements)
+    buffer.seek(0)
+    return buffer
+
+
+def intervention_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    grades = rng.uniform(55, 90, rows).round(1)
+    grades[rng.random(rows) < 0.1] = np.nan
+    return pd.DataFrame({
+        "StudentID": rng.integers(20000000, 20999999, rows),
+        "StudentName": [f"Student {i}" for i in range(rows)],
+        "SubjectCode": rng.choice(["IT101", "IT102", "CS201", "MATH1"], rows),
+        "SubjectDescription": rng.choice(["Programming 1", "Data Structures", "Calculus"], rows),
+        "Semester": rng.integers(1, 12, rows),
+        "CurrentGrade": grades,
+        "RiskFlag": np.where(np.isnan(grades), "Missing Grade", "At Risk (<75)"),
+    })
+
+
+def timed(build, df):
+    started = time.perf_counter()
+    size = len(build(df, "Benchmark Teacher").getvalue())
+    return time.perf_counter() - started, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time intervention list PDF generation.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--skip-legacy-above", type=int, default=None,
+                        help="do not run the baseline for larger lists")
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>8}  {'legacy':>10}  {'renderer':>10}  {'speedup':>8}  {'pages KB':>9}")
+    for rows in args.rows:
+        df = intervention_frame(rows)
+        new, size = timed(generate_pdf_intervention, df)
+        if args.skip_legacy_above is not None and rows > args.skip_legacy_above:
+            print(f"{rows:>8,}  {'-':>10}  {new:>9.2f}s  {'-':>8}  {size / 1024:>9.0f}")
+            continue
+        old, _ = timed(legacy_generate_pdf_intervention, df)
+        print(f"{rows:>8,}  {old:>9.2f}s  {new:>9.2f}s  {old / new:>7.1f}x  {size / 1024:>9.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from faculty import catalog, gpa_store, indexes, teachers
+from faculty.db import DATABASE_NAME, get_database
+
+##############################################
+# Seeded synthetic data
+#
+# Generates new_students, new_subjects, new_semesters and new_grades in
+# the production shape (one grade document per student per semester with
+# parallel SubjectCodes / Grades / Teachers arrays) at a given number of
+# enrollments, and loads them into a scratch database. The same seed and
+# scale always produce the same data.
+#
+#   MONGODB_TLS=0 python -m benchmarks.synthetic --uri mongodb://localhost:27017 --scale 100k
+#
+# --database defaults to faculty_bench; the app's database is refused.
+# After loading, the indexes are created, teacher keys backfilled and the
+# GPA store and teacher catalog built (--no-stores leaves them out to
+# measure the fallback paths).
+#
+# Grade documents carry no LastModified by default: nothing that writes
+# new_grades stamps one, and a stamp here would hide code that relies on
+# it. --last-modified adds one for experiments that need it.
+##############################################
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+BENCH_DATABASE = "faculty_bench"
+
+SCHOOL_YEARS = 4
+SEMESTERS_PER_STUDENT = 4
+SUBJECTS_PER_SEMESTER = 6
+SUBJECTS_PER_TEACHER = 4
+MISSING_GRADE_SHARE = 0.05
+BATCH_SIZE = 10_000
+
+COURSES = ["BSIT", "BSCS", "BSIS", "BSEMC", "BSED", "BSBA"]
+FIRST_NAMES = ["Juan", "Maria", "Jose", "Ana", "Mark", "Grace", "Paolo", "Joy", "Miguel", "Liza"]
+LAST_NAMES = ["Dela Cruz", "Santos", "Reyes", "Garcia", "Mendoza", "Torres", "Flores", "Ramos", "Cruz", "Bautista"]
+
+
+def parse_scale(value):
+    return SCALES.get(value.lower()) or int(value)
+
+
+def dimensions_for(enrollments):
+    # (students, subjects, teachers, semesters) sized for `enrollments`
+    per_student = SEMESTERS_PER_STUDENT * SUBJECTS_PER_SEMESTER
+    students = max(-(-enrollments // per_student), 1)
+    subjects = max(students // 25, 2 * SUBJECTS_PER_SEMESTER)
+    return students, subjects, max(subjects // SUBJECTS_PER_TEACHER, 1), 2 * SCHOOL_YEARS
+
+
+def generate(enrollments, seed=7, last_modified=False):
+    # {collection: documents}; new_grades is a generator
+    rng = np.random.default_rng(seed)
+    n_students, n_subjects, n_teachers, n_semesters = dimensions_for(enrollments)
+
+    semesters = [
+        {"_id": s + 1, "Semester": ("1st", "2nd")[s % 2] + " Semester", "SchoolYear": f"{2021 + s // 2}-{2022 + s // 2}"}
+        for s in range(n_semesters)
+    ]
+    teacher_names = [f"Teacher {t + 1:04d}" for t in range(n_teachers)]
+    subject_teacher = rng.integers(0, n_teachers, size=n_subjects)
+    subjects = [
+        {"_id": f"IT{c + 1:04d}", "Description": f"Subject {c + 1:04d}", "Units": int(rng.choice([2, 3, 3, 3, 5])),
+         "Teacher": teacher_names[subject_teacher[c]]}
+        for c in range(n_subjects)
+    ]
+
+    first = rng.integers(0, len(FIRST_NAMES), size=n_students)
+    last = rng.integers(0, len(LAST_NAMES), size=n_students)
+    students = [
+        {"_id": 2020000 + i, "Name": f"{LAST_NAMES[last[i]]}, {FIRST_NAMES[first[i]]} {i}",
+         "Course": COURSES[i % len(COURSES)], "YearLevel": int(1 + i % SCHOOL_YEARS)}
+        for i in range(n_students)
+    ]
+
+    def grades():
+        now = datetime.now(timezone.utc)
+        remaining = enrollments
+        for i, student in enumerate(students):
+            start = int(rng.integers(0, n_semesters - SEMESTERS_PER_STUDENT + 1))
+            for semester_id in range(start + 1, start + SEMESTERS_PER_STUDENT + 1):
+                if remaining <= 0:
+                    return
+                count = min(SUBJECTS_PER_SEMESTER, remaining)
+                remaining -= count
+                codes = rng.choice(n_subjects, size=count, replace=False)
+                marks = np.clip(np.rint(rng.normal(82, 8, size=count)), 60, 100)
+                missing = rng.random(count) < MISSING_GRADE_SHARE
+                doc = {
+                    "StudentID": student["_id"],
+                    "SemesterID": semester_id,
+                    "SubjectCodes": [subjects[c]["_id"] for c in codes],
+                    "Grades": [None if m else float(g) for g, m in zip(marks, missing)],
+                    "Teachers": [subjects[c]["Teacher"] for c in codes],
+                }
+                if last_modified:
+                    doc["LastModified"] = now
+                yield doc
+
+    return {"new_semesters": semesters, "new_subjects": subjects, "new_students": students, "new_grades": grades()}
+
+
+def load(db, enrollments, seed=7, stores=True, last_modified=False):
+    if db.name == DATABASE_NAME:
+        raise ValueError(f"refusing to overwrite the app database {db.name}")
+
+    counts = {}
+    for name, docs in generate(enrollments, seed, last_modified).items():
+        db[name].drop()
+        batch, counts[name] = [], 0
+        for doc in docs:
+            batch.append(doc)
+            if len(batch) >= BATCH_SIZE:
+                db[name].insert_many(batch, ordered=False)
+                counts[name] += len(batch)
+                batch = []
+        if batch:
+            db[name].insert_many(batch, ordered=False)
+            counts[name] += len(batch)
+
+    indexes.ensure_indexes(db)
+    teachers.backfill_teacher_keys(db)
+    if stores:
+        gpa_store.rebuild_semester_gpa(db)
+        catalog.rebuild_catalog(db)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load seeded synthetic Faculty Module data.")
+    parser.add_argument("--uri", help="MongoDB URI (defaults to MONGODB_URI)")
+    parser.add_argument("--database", default=BENCH_DATABASE, help=f"target database (default: {BENCH_DATABASE})")
+    parser.add_argument("--scale", default="10k", help="enrollments: 10k, 100k, 1m or a number")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-stores", action="store_true", help="skip the GPA store and teacher catalog builds")
+    parser.add_argument("--last-modified", action="store_true", help="stamp grade documents with LastModified")
+    args = parser.parse_args(argv)
+
+    db = get_database(args.uri, name=args.database)
+    started = time.perf_counter()
+    try:
+        counts = load(db, parse_scale(args.scale), seed=args.seed, stores=not args.no_stores,
+                      last_modified=args.last_modified)
+    except ValueError as e:
+        print("❌", e)
+        return 1
+
+    summary = ", ".join(f"{name} {count:,}" for name, count in counts.items())
+    print(f"✅ Loaded {args.database} in {time.perf_counter() - started:.1f} s: {summary}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import argparse
+import statistics
+import sys
+import time
+
+from faculty import dimensions, parallel, queries
+from faculty.db import get_database
+
+##############################################
+# Tab reads: one after another vs parallel.gather
+#
+# Times the independent reads of the Home, Class Grade Distribution and
+# Student Grade Analytics tabs issued sequentially and through
+# parallel.gather, with the dimension cache cleared before every run so
+# each read is a real round trip.
+#
+#   python -m benchmarks.tab_queries --teacher "Name" [--runs 5]
+##############################################
+
+
+def tab_calls(db, teacher):
+    return {
+        "Home": [
+            (queries.fetch, db, "subjects.by_teacher", teacher),
+            (dimensions.semesters, db),
+        ],
+        "Class Grade Distribution": [
+            (dimensions.semesters, db),
+            (dimensions.subject_descriptions, db),
+        ],
+        "Student Grade Analytics": [
+            (queries.fetch, db, "analytics.teacher_subjects", teacher),
+            (dimensions.semesters, db),
+        ],
+    }
+
+
+def timed(db, run, runs):
+    seconds = []
+    for _ in range(runs):
+        dimensions.invalidate_all(db)
+        started = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - started)
+    return statistics.median(seconds) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare sequential and parallel tab reads.")
+    parser.add_argument("--uri", help="MongoDB URI (defaults to MONGODB_URI)")
+    parser.add_argument("--teacher", required=True, help="teacher whose tabs to load")
+    parser.add_argument("--runs", type=int, default=5, help="runs per variant (median is reported)")
+    args = parser.parse_args(argv)
+
+    db = get_database(args.uri)
+    db.command("ping")  # open a connection before timing
+
+    for tab, calls in tab_calls(db, args.teacher).items():
+        sequential = timed(db, lambda: [call[0](*call[1:]) for call in calls], args.runs)
+        gathered = timed(db, lambda: parallel.gather(*calls), args.runs)
+        print(f"{tab:<26} sequential {sequential:8.1f} ms   gather {gathered:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
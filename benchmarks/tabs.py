@@ -0,0 +1,281 @@
+import argparse
+import json
+import platform
+import resource
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from pymongo.errors import PyMongoError
+
+from benchmarks.synthetic import BENCH_DATABASE
+from faculty import catalog, charts, dimensions, paging, parallel, progress, queries, reports
+from faculty.distribution import class_grade_distribution
+from faculty.exports import csv_bytes
+from faculty.pdf import df_to_pdf, generate_pdf_heatmap, generate_pdf_intervention, generate_pdf_submission
+from faculty.db import get_database
+
+##############################################
+# Tab suite
+#
+# Runs what each tab does for one teacher headlessly: the reads, the
+# pandas work and the render (table CSV, chart PNG or PDF), against a
+# database loaded by benchmarks.synthetic. Caches the app keeps across
+# reruns (dimensions, artifacts) are left warm; --cold clears the
+# dimension cache before every run. Per tab it records p50 / p95 latency,
+# the documents and index keys mongod examined (serverStatus counters) and
+# the process peak RSS once the tab has run.
+#
+#   MONGODB_TLS=0 python -m benchmarks.tabs --uri mongodb://localhost:27017 --json run.json
+#   MONGODB_TLS=0 python -m benchmarks.tabs --uri ... --baseline main.json --tolerance 0.2
+#
+# With --baseline it exits 1 when a tab's p95 is more than --tolerance
+# above the baseline's (or its documents examined grew), so two runs on
+# the same scale and machine can gate a change.
+##############################################
+
+LOW_GRADE_COLUMNS = ["StudentID", "Name", "SubjectCode", "SubjectDescription", "Teacher", "Semester",
+                     "SchoolYear", "Grade"]
+
+
+def bench_params(db, teacher=None):
+    # The teacher, one of their subjects / semesters / students, and a year level
+    teacher = teacher or catalog.teacher_names(db)[0]
+    grade = db["new_grades"].find_one({"Teachers": teacher}, {"StudentID": 1, "SemesterID": 1,
+                                                              "SubjectCodes": 1, "Teachers": 1})
+    if grade is None:
+        raise ValueError(f"no grade documents for teacher {teacher!r}")
+    student = db["new_students"].find_one({"_id": grade["StudentID"]}, {"YearLevel": 1}) or {}
+    return {
+        "teacher": teacher,
+        "subject_code": grade["SubjectCodes"][grade["Teachers"].index(teacher)],
+        "semester_id": grade["SemesterID"],
+        "student_id": grade["StudentID"],
+        "year_level": student.get("YearLevel", 1),
+    }
+
+
+def _low_grades_page(db, p, after, limit):
+    rows = queries.fetch(db, "custom.low_grades", p["subject_code"], p["teacher"], None, after, limit=limit or 0)
+    last = rows[-1]["_id"] if limit and len(rows) == limit else None
+    return pd.DataFrame(rows).reindex(columns=LOW_GRADE_COLUMNS), last
+
+
+def _grade_status(grades):
+    # The Analytics tab's Pass / Fail / Missing Grade column
+    grades = pd.to_numeric(grades, errors="coerce")
+    return np.select([grades.isna(), grades >= 75, grades < 75], ["Missing Grade", "Pass", "Fail"],
+                     default="Missing Grade")
+
+
+def tab_runs(db, p):
+    # {tab: run()}; each run reads, shapes and renders like the tab does
+    teacher = p["teacher"]
+
+    def login():
+        return catalog.teacher_names(db)
+
+    def home():
+        return parallel.gather((queries.fetch, db, "subjects.by_teacher", teacher), (dimensions.semesters, db))
+
+    def distribution():
+        _, subj_map = parallel.gather((dimensions.semesters, db), (dimensions.subject_descriptions, db))
+        pivot = class_grade_distribution(db, teacher, p["semester_id"], subj_map)
+        if pivot is not None:
+            charts.draw(charts.distribution_chart, pivot)
+            df_to_pdf(pivot, "Grade Distribution per Subject")
+
+    def tracker_year_level():
+        pager = paging.KeysetPager(lambda after, limit: progress.year_level_page(db, p["year_level"], after, limit),
+                                   columns=progress.year_level_columns(db))
+        pager.page()
+        paging.stream_csv(pager)
+
+    def tracker_student():
+        csv_bytes(progress.student_progress(db, p["student_id"]))
+
+    def heatmap():
+        data, subj_map = parallel.gather((queries.fetch, db, "heatmap.rows", teacher),
+                                         (dimensions.subject_descriptions, db))
+        df = pd.DataFrame(data)
+        if not df.empty:
+            generate_pdf_heatmap(reports.heatmap_summary(df, subj_map), teacher)
+
+    def intervention():
+        total, student_map, subj_map = parallel.gather(
+            (queries.count, db, "grades.by_teacher", teacher),
+            (dimensions.student_names, db),
+            (dimensions.subject_descriptions, db),
+        )
+        if total:
+            pager = paging.KeysetPager(
+                lambda after, limit: reports.intervention_page(db, teacher, student_map, subj_map, after, limit))
+            pager.page()
+            generate_pdf_intervention(pager.read_all(), teacher)
+
+    def submission():
+        data = queries.fetch(db, "submission.status", teacher)
+        if data:
+            df = pd.DataFrame(data)[reports.SUBMISSION_COLUMNS]
+            csv_bytes(df)
+            generate_pdf_submission(df, teacher)
+
+    def custom_query():
+        queries.fetch(db, "subjects.by_teacher", teacher)
+        pager = paging.KeysetPager(lambda after, limit: _low_grades_page(db, p, after, limit),
+                                   columns=LOW_GRADE_COLUMNS)
+        pager.page()
+        paging.stream_csv(pager)
+
+    def analytics():
+        parallel.gather((catalog.teacher_subjects, db, teacher), (dimensions.semesters, db))
+        df = pd.DataFrame(queries.fetch(db, "analytics.student_grades", p["subject_code"], teacher,
+                                        p["semester_id"]))
+        df = df.reindex(columns=sorted(set(df.columns) | {"Grade"}))
+        df["Status"] = _grade_status(df["Grade"])
+        charts.draw(charts.grade_counts_chart, df["Grade"], "Grade Distribution for " + p["subject_code"])
+        charts.draw(charts.pass_fail_chart, df["Status"], "Pass vs Fail for " + p["subject_code"])
+
+    return {
+        "login": login,
+        "home": home,
+        "distribution": distribution,
+        "tracker_year_level": tracker_year_level,
+        "tracker_student": tracker_student,
+        "heatmap": heatmap,
+        "intervention": intervention,
+        "submission": submission,
+        "custom_query": custom_query,
+        "analytics": analytics,
+    }
+
+
+def enrollment_count(db):
+    rows = list(db["new_grades"].aggregate([
+        {"$group": {"_id": None, "n": {"$sum": {"$size": "$SubjectCodes"}}}}
+    ]))
+    return rows[0]["n"] if rows else 0
+
+
+def examined(db):
+    # (documents, index keys) examined by mongod so far, or None where
+    # serverStatus is not allowed
+    try:
+        executor = db.client.admin.command("serverStatus")["metrics"]["queryExecutor"]
+    except (PyMongoError, KeyError):
+        return None
+    return executor["scannedObjects"], executor["scanned"]
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile(values, q):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def measure(db, run, runs, cold=False):
+    run()   # warm-up: imports, connections, first-touch caches
+    seconds, docs, keys = [], [], []
+    for _ in range(runs):
+        if cold:
+            dimensions.invalidate_all(db)
+        before = examined(db)
+        started = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - started)
+        after = examined(db)
+        if before is not None and after is not None:
+            docs.append(after[0] - before[0])
+            keys.append(after[1] - before[1])
+
+    return {
+        "runs": runs,
+        "p50_ms": round(percentile(seconds, 50) * 1000, 2),
+        "p95_ms": round(percentile(seconds, 95) * 1000, 2),
+        "docs_examined": int(statistics.median(docs)) if docs else None,
+        "keys_examined": int(statistics.median(keys)) if keys else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def regressions(results, baseline, tolerance):
+    # [(tab, reason)] for tabs slower or reading more than the baseline
+    found = []
+    for tab, current in results["tabs"].items():
+        previous = baseline.get("tabs", {}).get(tab)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            found.append((tab, f"p95 {previous['p95_ms']:.1f} → {current['p95_ms']:.1f} ms"))
+        if None not in (current["docs_examined"], previous["docs_examined"]) \
+                and current["docs_examined"] > previous["docs_examined"] * (1 + tolerance):
+            found.append((tab, f"documents examined {previous['docs_examined']:,} → {current['docs_examined']:,}"))
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time every tab headlessly against synthetic data.")
+    parser.add_argument("--uri", help="MongoDB URI (defaults to MONGODB_URI)")
+    parser.add_argument("--database", default=BENCH_DATABASE, help=f"database to read (default: {BENCH_DATABASE})")
+    parser.add_argument("--teacher", help="teacher to load the tabs for (default: the first in the catalog)")
+    parser.add_argument("--tabs", nargs="+", help="only these tabs")
+    parser.add_argument("--runs", type=int, default=10, help="timed runs per tab (default: 10)")
+    parser.add_argument("--cold", action="store_true", help="clear the dimension cache before every run")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 growth over the baseline")
+    args = parser.parse_args(argv)
+
+    db = get_database(args.uri, name=args.database)
+    db.command("ping")  # open a connection before timing
+    try:
+        params = bench_params(db, args.teacher)
+    except (ValueError, IndexError):
+        print(f"❌ No data for the benchmark in {args.database}; load it with benchmarks.synthetic")
+        return 1
+
+    results = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "database": args.database,
+        "enrollments": enrollment_count(db),
+        "python": platform.python_version(),
+        "cold": args.cold,
+        "params": params,
+        "tabs": {},
+    }
+    print(f"{'tab':<20} {'p50 ms':>9} {'p95 ms':>9} {'docs':>10} {'keys':>10} {'peak MiB':>9}")
+    for tab, run in tab_runs(db, params).items():
+        if args.tabs and tab not in args.tabs:
+            continue
+        row = results["tabs"][tab] = measure(db, run, args.runs, cold=args.cold)
+        docs = "-" if row["docs_examined"] is None else f"{row['docs_examined']:,}"
+        keys = "-" if row["keys_examined"] is None else f"{row['keys_examined']:,}"
+        print(f"{tab:<20} {row['p50_ms']:9.1f} {row['p95_ms']:9.1f} {docs:>10} {keys:>10} {row['peak_rss_mb']:9.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"✅ Wrote {args.json}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for tab, reason in found:
+            print(f"❌ {tab}: {reason}")
+        if found:
+            return 1
+        print(f"✅ No tab regressed more than {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
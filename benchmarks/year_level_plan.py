@@ -0,0 +1,48 @@
+import argparse
+import sys
+
+from faculty.db import get_database
+from faculty.progress import year_level_plan
+
+##############################################
+# YearLevel tracker: join-everything vs cohort-first
+#
+# Explains both plans with executionStats and prints the index keys and
+# documents examined (the $lookups included) against the rows returned.
+#
+#   python -m benchmarks.year_level_plan [--year-level 1]
+##############################################
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the YearLevel tracker query plans.")
+    parser.add_argument("--uri", help="MongoDB URI (defaults to MONGODB_URI)")
+    parser.add_argument("--year-level", type=int, help="year level to explain (defaults to one found in new_students)")
+    args = parser.parse_args(argv)
+
+    db = get_database(args.uri)
+    year_level = args.year_level
+    if year_level is None:
+        student = db["new_students"].find_one({"YearLevel": {"$exists": True}}, {"YearLevel": 1})
+        if student is None:
+            print("❌ new_students is empty")
+            return 1
+        year_level = student["YearLevel"]
+
+    print(f"YearLevel {year_level}")
+    results = {}
+    for label, cohort_first in (("join everything", False), ("cohort first", True)):
+        plan = results[label] = year_level_plan(db, year_level, cohort_first=cohort_first)
+        cohort = "" if plan["cohort"] is None else f", {plan['cohort']:,} students in {plan['chunks']} chunk(s)"
+        print(f"\n{label}{cohort}")
+        print(f"  keys examined  {plan['keys_examined']:>12,}")
+        print(f"  docs examined  {plan['docs_examined']:>12,}")
+        print(f"  rows returned  {plan['returned']:>12,}")
+
+    before, after = results["join everything"]["docs_examined"], results["cohort first"]["docs_examined"]
+    print(f"\ndocuments examined: {before:,} -> {after:,} ({before / max(after, 1):,.1f}x fewer)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
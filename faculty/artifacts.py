@@ -0,0 +1,176 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+##############################################
+# Report artifact cache
+#
+# Rendered PDFs, CSVs and chart images keyed on their content:
+#   (builder, frame_digest() of the input DataFrame, arguments...)
+# Any change to the data the file is drawn from - a grade filled in place
+# included - changes the digest, so a stale artifact is never served and
+# nothing has to be invalidated by hand. Exports that read their rows only
+# while being built (paged results) are not cached here; see
+# faculty.exports.
+#
+# Memory is an LRU bounded by bytes (FACULTY_ARTIFACT_MAX_BYTES, default
+# 64 MiB). With FACULTY_ARTIFACT_DIR set every artifact is also written
+# there (bounded by FACULTY_ARTIFACT_DISK_BYTES, oldest first), so other
+# Streamlit worker processes and restarts pick it up, and entries evicted
+# from memory are served from disk.
+##############################################
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_BYTES = 512 * 1024 * 1024
+
+
+class ArtifactCache:
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, spill_dir=None, max_disk_bytes=DEFAULT_DISK_BYTES):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def _path(self, key):
+        name = hashlib.blake2b(repr(key).encode(), digest_size=20).hexdigest()
+        return os.path.join(self.spill_dir, name + ".bin")
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        if self.spill_dir:
+            try:
+                with open(self._path(key), "rb") as f:
+                    data = f.read()
+            except OSError:
+                data = None
+            if data is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, data)
+                return data
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, data):
+        with self._lock:
+            self._remember(key, data)
+        if self.spill_dir:
+            self._write(key, data)
+
+    def get_or_build(self, key, build):
+        data = self.get(key)
+        if data is None:
+            data = build()
+            self.put(key, data)
+        return data
+
+    def _remember(self, key, data):
+        # caller holds the lock
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        if len(data) > self.max_bytes:
+            return
+        self._entries[key] = data
+        self._bytes += len(data)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def _write(self, key, data):
+        # Atomic rename so a concurrent reader in another process never sees
+        # a partial file
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self._prune_disk()
+        except OSError as e:
+            print("❌ Could not spill artifact to disk:", e)
+
+    def _prune_disk(self):
+        files = []
+        for entry in os.scandir(self.spill_dir):
+            if entry.name.endswith(".bin"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "spill_dir": self.spill_dir,
+            }
+
+
+ARTIFACTS = ArtifactCache(
+    max_bytes=int(os.getenv("FACULTY_ARTIFACT_MAX_BYTES", DEFAULT_MAX_BYTES)),
+    spill_dir=os.getenv("FACULTY_ARTIFACT_DIR") or None,
+    max_disk_bytes=int(os.getenv("FACULTY_ARTIFACT_DISK_BYTES", DEFAULT_DISK_BYTES)),
+)
+
+
+def cache_stats():
+    return ARTIFACTS.stats()
+
+
+def frame_digest(data):
+    # Content hash of a DataFrame / Series: values, index, names and dtypes
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(data, pd.Series):
+        h.update(repr((str(data.name), str(data.dtype))).encode())
+    else:
+        h.update(repr([(str(c), str(t)) for c, t in data.dtypes.items()]).encode())
+    try:
+        hashed = pd.util.hash_pandas_object(data, index=True)
+    except TypeError:
+        # unhashable cells (lists, dicts): hash their text instead
+        hashed = pd.util.hash_pandas_object(data.astype(str), index=True)
+    h.update(hashed.to_numpy().tobytes())
+    return h.hexdigest()
+
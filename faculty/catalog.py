@@ -0,0 +1,193 @@
+import argparse
+import sys
+from datetime import datetime, timezone
+
+from faculty import queries
+from faculty.db import get_database
+from faculty.freshness import DerivedStore, grades_token
+
+##############################################
+# Teacher catalog
+#
+# teacher_catalog holds one document per teacher (as spelled in
+# new_grades.Teachers) listing every subject / semester the teacher has
+# grades for. The login dropdown and the Student Grade Analytics subject
+# list then read this small collection instead of running a distinct or
+# an $unwind over new_grades.
+#
+#   _id               teacher name
+#   Subjects          [{SubjectCode, SemesterID, SchoolYear, Semester}],
+#                     ordered by SchoolYear, Semester, SubjectCode; a
+#                     semester missing from new_semesters has no labels
+#   RefreshedAt
+#
+# Every teacher named in new_grades gets a document, as distinct("Teachers")
+# listed them, even when their grades only reference unknown semesters;
+# the Analytics list leaves those subjects out, like its pipeline did.
+#
+# Refresh paths (see faculty.freshness):
+#   rebuild_catalog()    full rebuild with $out
+#   refresh_teachers()   recompute the given teachers (call after writing
+#                        their grade documents)
+#   refresh_changed()    the teachers of newly inserted grade documents, or
+#                        a full rebuild when the source changed in any
+#                        other way or the last rebuild is too old
+# Reads use the catalog only while catalog_ready(); otherwise they fall
+# back to the new_grades queries.
+##############################################
+
+CATALOG_COLLECTION = "teacher_catalog"
+STORE = DerivedStore("teacher_catalog", env="CATALOG", label="teacher catalog")
+
+CHUNK_SIZE = 200
+
+
+def catalog_pipeline(teacher_names=None, refreshed_at=None):
+    pipeline = []
+    if teacher_names is not None:
+        pipeline.append({"$match": {"Teachers": {"$in": teacher_names}}})
+
+    pipeline += [
+        # One row per array position, with its teacher
+        {"$unwind": {"path": "$SubjectCodes", "includeArrayIndex": "idx"}},
+        {
+            "$project": {
+                "SubjectCode": "$SubjectCodes",
+                "Teacher": {"$arrayElemAt": ["$Teachers", "$idx"]},
+                "SemesterID": 1
+            }
+        },
+        {"$match": {"Teacher": {"$nin": [None, ""]} if teacher_names is None else {"$in": teacher_names}}},
+
+        # Distinct (teacher, subject, semester)
+        {"$group": {"_id": {"Teacher": "$Teacher", "SubjectCode": "$SubjectCode", "SemesterID": "$SemesterID"}}},
+
+        # Semester labels; rows of unknown semesters are kept without them
+        {
+            "$lookup": {
+                "from": "new_semesters",
+                "localField": "_id.SemesterID",
+                "foreignField": "_id",
+                "as": "sem_info"
+            }
+        },
+        {"$unwind": {"path": "$sem_info", "preserveNullAndEmptyArrays": True}},
+        {"$sort": {"_id.Teacher": 1, "sem_info.SchoolYear": 1, "sem_info.Semester": 1, "_id.SubjectCode": 1}},
+
+        # One document per teacher
+        {
+            "$group": {
+                "_id": "$_id.Teacher",
+                "Subjects": {"$push": {
+                    "SubjectCode": "$_id.SubjectCode",
+                    "SemesterID": "$_id.SemesterID",
+                    "SchoolYear": "$sem_info.SchoolYear",
+                    "Semester": "$sem_info.Semester"
+                }}
+            }
+        },
+        {"$set": {"RefreshedAt": refreshed_at or "$$NOW"}}
+    ]
+    return pipeline
+
+
+def rebuild_catalog(db):
+    token, started = grades_token(db), datetime.now(timezone.utc)
+    db["new_grades"].aggregate(catalog_pipeline() + [{"$out": CATALOG_COLLECTION}])
+    STORE.record(db, token, rebuilt_at=started)
+    return db[CATALOG_COLLECTION].estimated_document_count()
+
+
+def refresh_teachers(db, teacher_names):
+    # Recompute whole teachers: $merge replaces their documents in place,
+    # then a teacher the run did not emit (no grades left) loses its
+    # document, so the login list never briefly drops a teacher
+    teacher_names = [t for t in dict.fromkeys(teacher_names) if t]
+    catalog = db[CATALOG_COLLECTION]
+    refreshed_at = datetime.now(timezone.utc)
+
+    for start in range(0, len(teacher_names), CHUNK_SIZE):
+        chunk = teacher_names[start:start + CHUNK_SIZE]
+        db["new_grades"].aggregate(catalog_pipeline(chunk, refreshed_at) + [{
+            "$merge": {
+                "into": CATALOG_COLLECTION,
+                "on": "_id",
+                "whenMatched": "replace",
+                "whenNotMatched": "insert"
+            }
+        }])
+        catalog.delete_many({"_id": {"$in": chunk}, "RefreshedAt": {"$ne": refreshed_at}})
+    return len(teacher_names)
+
+
+def refresh_changed(db):
+    action, token, inserted = STORE.plan(db)
+    if action == "rebuild":
+        return rebuild_catalog(db)
+    if action == "insert":
+        count = refresh_teachers(db, db["new_grades"].distinct("Teachers", inserted))
+        STORE.record(db, token)
+        return count
+    return 0
+
+
+def catalog_ready(db):
+    # True while the catalog matches new_grades (faculty.freshness)
+    return STORE.ready(db)
+
+
+def refresh_in_background(db):
+    STORE.refresh_in_background(db, refresh_changed)
+
+
+##############################################
+# Reads
+##############################################
+
+def teacher_names(db):
+    # Sorted teacher names for the login dropdown
+    if catalog_ready(db):
+        return [doc["_id"] for doc in queries.fetch(db, "catalog.teachers")]
+    return sorted(filter(None, queries.fetch(db, "grades.teachers")))
+
+
+def teacher_subjects(db, teacher_name):
+    # [{SubjectCode, Teacher, SchoolYear, Semester}] for the Analytics tab
+    if not catalog_ready(db):
+        return queries.fetch(db, "analytics.teacher_subjects", teacher_name)
+
+    docs = queries.fetch(db, "catalog.by_teacher", teacher_name)
+    subjects = docs[0]["Subjects"] if docs else []
+    # One row per (subject, school year, semester) with known labels, in
+    # the order the Analytics pipeline sorted them
+    rows = {
+        (s["SubjectCode"], s["SchoolYear"], s["Semester"]): None
+        for s in subjects
+        if s.get("SchoolYear") is not None
+    }
+    return [
+        {"SubjectCode": code, "Teacher": teacher_name, "SchoolYear": year, "Semester": semester}
+        for code, year, semester in sorted(rows, key=lambda r: (r[1], r[2], r[0]))
+    ]
+
+
+##############################################
+# CLI: python -m faculty.catalog [--rebuild]
+##############################################
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the teacher_catalog collection.")
+    parser.add_argument("--uri", help="MongoDB URI (defaults to MONGODB_URI)")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild every teacher from new_grades")
+    args = parser.parse_args(argv)
+
+    db = get_database(args.uri)
+    if args.rebuild:
+        print(f"✅ Rebuilt the catalog: {rebuild_catalog(db)} teacher(s)")
+    else:
+        print(f"✅ Refreshed the catalog: {refresh_changed(db)} teacher(s) recomputed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import numpy as np
+
+from faculty import telemetry
+from faculty.artifacts import ARTIFACTS, frame_digest
+
+##############################################
+# Charts
+#
+# The app's matplotlib graphs, drawn on standalone Figure objects with an
+# Agg canvas instead of the pyplot state machine. pyplot keeps every figure
+# it creates in a global registry until plt.close(); these figures are
+# never registered, are cleared right after savefig and are freed with the
+# last reference, so a long-running worker does not accumulate them.
+#
+# render() returns PNG or SVG bytes memoized in the artifact cache under
+# (builder, data hash, arguments, format): a rerun with the same data
+# serves the cached image without touching matplotlib. render_async()
+# does the same on a worker thread (FACULTY_CHART_WORKERS, default 1 -
+# matplotlib only promises thread safety per figure, so keep it small).
+#
+# Builders take (data, *args) and draw on the Figure they return.
+# matplotlib itself is imported by the first new_figure() call, not at
+# startup.
+##############################################
+
+CHART_WORKERS = int(os.getenv("FACULTY_CHART_WORKERS", "1"))
+DPI = 200  # what st.pyplot renders with
+
+STATUS_COLORS = {
+    "Pass": "#1976d2",
+    "Fail": "red",
+    "Missing Grade": "orange",
+}
+
+DISTRIBUTION_SERIES = [
+    ("95-100", "#2ecc71"),     # green
+    ("90-94", "#27ae60"),      # dark green
+    ("85-89", "#3498db"),      # blue
+    ("80-84", "#f1c40f"),      # yellow
+    ("75-79", "#e67e22"),      # orange
+    ("Below 75", "#e74c3c"),   # red
+    ("No Grade", "#95a5a6"),   # gray
+]
+
+_lock = threading.Lock()
+_executor = None
+
+
+def new_figure(figsize):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def figure_bytes(fig, fmt="png"):
+    buffer = BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, dpi=DPI, bbox_inches="tight")
+    finally:
+        # Drop the artists now rather than whenever the figure is collected
+        fig.clear()
+    return buffer.getvalue()
+
+
+def draw(builder, data, *args, fmt="png"):
+    # Uncached render
+    with telemetry.span("chart." + builder.__name__):
+        return figure_bytes(builder(data, *args), fmt)
+
+
+def chart_key(builder, data, *args, fmt="png"):
+    return ("chart", builder.__qualname__, fmt, frame_digest(data)) + tuple(repr(a) for a in args)
+
+
+def render(builder, data, *args, fmt="png"):
+    return ARTIFACTS.get_or_build(chart_key(builder, data, *args, fmt=fmt),
+                                  lambda: draw(builder, data, *args, fmt=fmt))
+
+
+def render_async(builder, data, *args, fmt="png"):
+    # Future of render(); already-cached charts come back completed
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=CHART_WORKERS, thread_name_prefix="chart")
+    return _executor.submit(render, builder, data, *args, fmt=fmt)
+
+
+##############################################
+# Builders
+##############################################
+
+def _count_bars(counts, label, title, colors):
+    fig = new_figure((8, 4))
+    ax = fig.add_subplot()
+    bars = ax.bar(counts[label], counts["count"], color=colors)
+
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2, height + 0.1, str(height),
+                ha='center', va='bottom', fontsize=8, fontweight='regular')
+
+    ax.set_xlabel('Grade')
+    ax.set_ylabel('Frequency')
+    ax.set_title(title)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    return fig
+
+
+def grade_counts_chart(grades, title):
+    # grades: Series of grades; one bar per distinct grade
+    counts = grades.value_counts().reset_index()
+    counts.columns = ['Grade', 'count']
+    return _count_bars(counts, 'Grade', title, '#1976d2')
+
+
+def pass_fail_chart(statuses, title):
+    # statuses: Series of Pass / Fail / Missing Grade
+    counts = statuses.value_counts().reset_index()
+    counts.columns = ['Status', 'count']
+    return _count_bars(counts, 'Status', title, counts['Status'].map(STATUS_COLORS))
+
+
+def distribution_chart(pivot):
+    # pivot: class_grade_distribution() table; grouped bars per subject
+    labels = pivot["SubjectCode"].tolist()
+
+    x = np.arange(len(labels))                 # subject positions
+    n_groups = len(DISTRIBUTION_SERIES)        # 7 ranges
+    width = 0.8 / n_groups                     # auto width so they fit
+
+    fig = new_figure((12, 6))
+    ax = fig.add_subplot()
+
+    # Plot each grade range with proper offset and color
+    for i, (name, color) in enumerate(DISTRIBUTION_SERIES):
+        offset = (i - n_groups/2) * width + width/2
+        rects = ax.bar(x + offset, pivot[name].tolist(), width, label=name, color=color)
+        ax.bar_label(rects, padding=2, fontsize=8)
+
+    ax.set_ylabel("Number of Students")
+    ax.set_title("Grade Distribution per Subject")
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels, rotation=45, ha="right")
+    ax.legend(title="Grade Range", bbox_to_anchor=(1.05, 1), loc="upper left")
+
+    fig.tight_layout()
+    return fig
+
+
+SPAN_COLORS = {"command": "#1976d2", "python": "#e67e22"}
+
+
+def waterfall_chart(events):
+    # events: telemetry.waterfall_frame() rows; one bar per command / span
+    # from its start to its end, in start order
+    labels = [
+        f"{row.query or row.command} ({row.collection})" if row.kind == "command" and row.collection
+        else str(row.query or row.command)
+        for row in events.itertuples()
+    ]
+    fig = new_figure((6, max(2, 0.3 * len(labels) + 1)))
+    ax = fig.add_subplot()
+    y = np.arange(len(labels))
+    ax.barh(y, events["duration_ms"], left=events["start_ms"], color=events["kind"].map(SPAN_COLORS))
+
+    ax.set_yticks(y)
+    ax.set_yticklabels(labels, fontsize=7)
+    ax.invert_yaxis()
+    ax.set_xlabel("ms since the rerun began")
+    ax.grid(axis="x", linestyle="--", alpha=0.7)
+    fig.tight_layout()
+    return fig
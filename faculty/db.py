@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from faculty import telemetry
+
+DATABASE_NAME = "mit261n_new"
+
+# Pool sizing, overridable through the environment (.env)
+DEFAULT_MAX_POOL_SIZE = 50
+DEFAULT_MIN_POOL_SIZE = 2
+DEFAULT_MAX_IDLE_TIME_MS = 300000
+DEFAULT_HEALTH_INTERVAL_S = 30
+
+##############################################
+# Process-wide client registry
+#
+# Streamlit re-executes app.py on every widget interaction, but imported
+# modules stay loaded, so the clients kept here are shared by every
+# session served by this process. Each client owns a connection pool;
+# handing out the same instance avoids a TLS handshake per rerun.
+##############################################
+
+_lock = threading.Lock()
+_clients = {}
+_health = {}
+_env_loaded = False
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return int(value)
+
+
+def _load_env():
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
+
+def pool_options():
+    _load_env()
+    return {
+        "maxPoolSize": _env_int("MONGODB_MAX_POOL_SIZE", DEFAULT_MAX_POOL_SIZE),
+        "minPoolSize": _env_int("MONGODB_MIN_POOL_SIZE", DEFAULT_MIN_POOL_SIZE),
+        "maxIdleTimeMS": _env_int("MONGODB_MAX_IDLE_TIME_MS", DEFAULT_MAX_IDLE_TIME_MS),
+    }
+
+
+def get_client(uri=None):
+    _load_env()
+    uri = uri or os.getenv("MONGODB_URI")
+
+    client = _clients.get(uri)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(uri)
+        if client is None:
+            # MongoClient connects lazily in the background, so nothing
+            # here blocks the calling rerun on the network.
+            client = MongoClient(
+                uri,
+                serverSelectionTimeoutMS=5000,   # Fail fast if can't connect
+                socketTimeoutMS=60000,           # Time before dropping socket
+                connectTimeoutMS=10000,          # Time to establish connection
+                retryWrites=True,
+                tls=os.getenv("MONGODB_TLS", "1") != "0",   # MONGODB_TLS=0 for a local mongod
+                event_listeners=telemetry.listeners(),       # FACULTY_COMMAND_METRICS=1
+                **pool_options(),
+            )
+            _clients[uri] = client
+            _start_health_check(uri, client)
+    return client
+
+
+def get_database(uri=None, name=DATABASE_NAME):
+    return get_client(uri)[name]
+
+
+##############################################
+# Background health checks
+##############################################
+
+def _start_health_check(uri, client):
+    _health[uri] = {"ok": None, "checked_at": None, "latency_ms": None, "error": None}
+    interval = _env_int("MONGODB_HEALTH_INTERVAL_S", DEFAULT_HEALTH_INTERVAL_S)
+
+    thread = threading.Thread(
+        target=_health_loop,
+        args=(uri, client, interval),
+        name="mongo-health-check",
+        daemon=True,
+    )
+    thread.start()
+
+
+def _health_loop(uri, client, interval):
+    while _clients.get(uri) is client:
+        previous = _health.get(uri, {}).get("ok")
+        started = time.perf_counter()
+        try:
+            client.admin.command("ping")
+            status = {"ok": True, "error": None}
+        except PyMongoError as e:
+            status = {"ok": False, "error": str(e)}
+
+        status["checked_at"] = time.time()
+        status["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        if _clients.get(uri) is not client:
+            break
+        _health[uri] = status
+
+        # Only report transitions so the log is not flooded every interval
+        if status["ok"] != previous:
+            if status["ok"]:
+                print("✅ Connected to MongoDB Atlas successfully!")
+            else:
+                print("❌ Could not connect to MongoDB:", status["error"])
+
+        time.sleep(interval)
+
+
+def health_status(uri=None):
+    _load_env()
+    uri = uri or os.getenv("MONGODB_URI")
+    return dict(_health.get(uri, {"ok": None}))
+
+
+def close_clients():
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _health.clear()
+    for client in clients:
+        client.close()
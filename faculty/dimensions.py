@@ -0,0 +1,150 @@
+import threading
+import time
+
+from pymongo import DESCENDING
+
+##############################################
+# Reference dimension cache
+#
+# Subjects, students and semesters are small, rarely-written lookup
+# tables that the tabs join against in Python. They are loaded once per
+# process and shared by every session. After `ttl` seconds the next read
+# runs a cheap version check (document count + max _id) and only reloads
+# the collection when that token changed. In-place edits do not move the
+# token, so `max_age` forces a full reload regardless.
+##############################################
+
+
+class Dimension:
+
+    def __init__(self, name, collection, projection, ttl=300, max_age=3600, sort=None):
+        self.name = name
+        self.collection = collection
+        self.projection = projection
+        self.ttl = ttl
+        self.max_age = max_age
+        self.sort = sort or [("_id", 1)]
+
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def _version(self, coll):
+        last = list(coll.find({}, {"_id": 1}).sort("_id", DESCENDING).limit(1))
+        return (coll.estimated_document_count(), last[0]["_id"] if last else None)
+
+    def _load(self, coll):
+        docs = list(coll.find({}, self.projection).sort(self.sort))
+        return {"docs": docs, "by_id": {d["_id"]: d for d in docs}, "fields": {}}
+
+    def _entry(self, db):
+        key = db.name
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry["checked_at"]
+                if age < self.ttl:
+                    self.hits += 1
+                    return entry
+
+                coll = db[self.collection]
+                if now - entry["loaded_at"] < self.max_age:
+                    version = self._version(coll)
+                    if version == entry["version"]:
+                        self.hits += 1
+                        self.revalidations += 1
+                        entry["checked_at"] = now
+                        return entry
+            else:
+                coll = db[self.collection]
+
+            self.misses += 1
+            version = self._version(coll)
+            entry = self._load(coll)
+            entry.update(version=version, loaded_at=now, checked_at=now)
+            self._entries[key] = entry
+            return entry
+
+    def docs(self, db):
+        return self._entry(db)["docs"]
+
+    def version(self, db):
+        # The version token the cached load was taken at
+        return self._entry(db)["version"]
+
+    def by_id(self, db):
+        return self._entry(db)["by_id"]
+
+    def field_map(self, db, field, default=""):
+        # {_id: doc[field]}, built once per load
+        entry = self._entry(db)
+        fields = entry["fields"]
+        if field not in fields:
+            fields[field] = {d["_id"]: d.get(field, default) for d in entry["docs"]}
+        return fields[field]
+
+    def invalidate(self, db=None):
+        with self._lock:
+            if db is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(db.name, None)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+        }
+
+
+SUBJECTS = Dimension(
+    "subjects", "new_subjects",
+    {"_id": 1, "Description": 1, "Units": 1, "Teacher": 1},
+    ttl=600,
+)
+STUDENTS = Dimension(
+    "students", "new_students",
+    {"_id": 1, "Name": 1, "Course": 1, "YearLevel": 1},
+    ttl=300,
+)
+SEMESTERS = Dimension(
+    "semesters", "new_semesters",
+    {"_id": 1, "Semester": 1, "SchoolYear": 1},
+    ttl=3600,
+)
+
+DIMENSIONS = [SUBJECTS, STUDENTS, SEMESTERS]
+
+
+def subject_descriptions(db):
+    return SUBJECTS.field_map(db, "Description")
+
+
+def student_map(db):
+    return STUDENTS.by_id(db)
+
+
+def student_names(db):
+    return STUDENTS.field_map(db, "Name")
+
+
+def semesters(db):
+    return SEMESTERS.docs(db)
+
+
+def versions(db):
+    return tuple(dim.version(db) for dim in DIMENSIONS)
+
+
+def invalidate_all(db=None):
+    for dim in DIMENSIONS:
+        dim.invalidate(db)
+
+
+def cache_stats():
+    return {dim.name: dim.stats() for dim in DIMENSIONS}
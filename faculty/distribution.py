@@ -0,0 +1,97 @@
+import os
+
+import pandas as pd
+
+from faculty import queries, telemetry
+from faculty.enrollments import explode_grades
+from faculty.pipelines import GRADE_BINS, GRADE_LABELS, NO_GRADE
+
+##############################################
+# Class Grade Distribution
+#
+# Two ways to build the (subject x grade range) pivot:
+#   "pushdown"  MongoDB buckets and counts per SubjectCode/GradeRange, so
+#               only O(subjects x ranges) rows cross the wire
+#   "client"    fetch the teacher's grade documents, explode and pd.cut
+# Both produce the same pivot. Select with FACULTY_DISTRIBUTION_MODE.
+##############################################
+
+ORDERED_COLUMNS = ["95-100", "90-94", "85-89", "80-84", "75-79", "Below 75", NO_GRADE, "Total"]
+
+DEFAULT_MODE = "pushdown"
+
+
+def distribution_mode():
+    return os.getenv("FACULTY_DISTRIBUTION_MODE", DEFAULT_MODE)
+
+
+def _finish_pivot(pivot):
+    # Add total
+    pivot["Total"] = pivot.sum(axis=1)
+
+    # remove row with zero total
+    pivot = pivot[pivot["Total"] > 0]
+
+    # Reorder columns
+    pivot = pivot.reindex(columns=ORDERED_COLUMNS, fill_value=0)
+
+    # Reset index for display
+    return pivot.reset_index()
+
+
+def pivot_from_enrollments(df, subj_map):
+    df = df.copy()
+    df["SubjectDescription"] = df["SubjectCode"].map(subj_map)
+
+    df["GradeRange"] = pd.cut(df["Grade"], bins=GRADE_BINS, labels=GRADE_LABELS, include_lowest=True)
+
+    # ✅ Mark missing/null grades as "No Grade"
+    df["GradeRange"] = df["GradeRange"].cat.add_categories([NO_GRADE])
+    df["GradeRange"] = df["GradeRange"].fillna(NO_GRADE)
+
+    pivot = pd.pivot_table(
+        df,
+        index=["SubjectCode", "SubjectDescription"],
+        columns=["GradeRange"],
+        values="StudentID",
+        aggfunc="count",
+        fill_value=0,
+    )
+    return _finish_pivot(pivot)
+
+
+def pivot_from_counts(rows, subj_map):
+    counts = pd.DataFrame(rows, columns=["SubjectCode", "GradeRange", "count"])
+    counts["SubjectDescription"] = counts["SubjectCode"].map(subj_map)
+
+    pivot = pd.pivot_table(
+        counts,
+        index=["SubjectCode", "SubjectDescription"],
+        columns=["GradeRange"],
+        values="count",
+        aggfunc="sum",
+        fill_value=0,
+    )
+    return _finish_pivot(pivot)
+
+
+def class_grade_distribution(db, teacher_name, semester_id, subj_map, mode=None):
+    # Returns the pivot, or None when the teacher has no records that semester
+    mode = mode or distribution_mode()
+
+    if mode == "pushdown":
+        rows = queries.fetch(db, "distribution.buckets", teacher_name, semester_id)
+        if not rows:
+            return None
+        with telemetry.span("distribution.pivot"):
+            return pivot_from_counts(rows, subj_map)
+
+    if mode == "client":
+        data = queries.fetch(db, "grades.by_teacher_semester", teacher_name, semester_id)
+        df = explode_grades(data, teacher=teacher_name)
+        if df.empty:
+            return None
+        with telemetry.span("distribution.pivot"):
+            return pivot_from_enrollments(df, subj_map)
+
+    raise ValueError(f"Unknown distribution mode: {mode}")
@@ -0,0 +1,68 @@
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+##############################################
+# Grade document -> enrollment rows
+#
+# new_grades documents hold parallel SubjectCodes / Grades / Teachers
+# arrays. explode_grades() turns a cursor of them into one row per
+# SubjectCodes entry using flat NumPy arrays and offsets, with no per-row
+# Python dicts. Grades / Teachers shorter than SubjectCodes (ragged
+# documents) yield NaN / None for the missing positions; extra trailing
+# entries are ignored.
+##############################################
+
+ENROLLMENT_COLUMNS = ["StudentID", "SemesterID", "SubjectCode", "Grade", "Teacher"]
+
+
+def _flatten(arrays, lengths):
+    flat = np.empty(int(lengths.sum()), dtype=object)
+    flat[:] = list(chain.from_iterable(arrays))
+    return flat
+
+
+def _aligned(arrays, row_doc, pos):
+    # Pick arrays[row_doc[k]][pos[k]] for every row k, None when out of range
+    lengths = np.fromiter(map(len, arrays), dtype=np.int64, count=len(arrays))
+    starts = np.cumsum(lengths) - lengths
+    flat = _flatten(arrays, lengths)
+
+    out = np.full(len(row_doc), None, dtype=object)
+    valid = pos < lengths[row_doc]
+    out[valid] = flat[starts[row_doc[valid]] + pos[valid]]
+    return out
+
+
+def explode_grades(docs, teacher=None, doc_fields=("StudentID", "SemesterID")):
+    docs = docs if isinstance(docs, list) else list(docs)
+
+    subjects = [d.get("SubjectCodes") or [] for d in docs]
+    grades = [d.get("Grades") or [] for d in docs]
+    teachers = [d.get("Teachers") or [] for d in docs]
+
+    counts = np.fromiter(map(len, subjects), dtype=np.int64, count=len(docs))
+    total = int(counts.sum())
+
+    # Row k belongs to document row_doc[k] at array position pos[k]
+    row_doc = np.repeat(np.arange(len(docs)), counts)
+    pos = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    columns = {}
+    for field in doc_fields:
+        values = np.empty(len(docs), dtype=object)
+        values[:] = [d.get(field) for d in docs]
+        columns[field] = values[row_doc]
+
+    columns["SubjectCode"] = _flatten(subjects, counts)
+    columns["Grade"] = _aligned(grades, row_doc, pos)
+    columns["Teacher"] = _aligned(teachers, row_doc, pos)
+
+    if teacher is not None:
+        keep = columns["Teacher"] == teacher
+        columns = {name: values[keep] for name, values in columns.items()}
+
+    df = pd.DataFrame(columns).infer_objects()
+    df["Grade"] = pd.to_numeric(df["Grade"], errors="coerce").astype("float64")
+    return df
@@ -0,0 +1,128 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import streamlit as st
+
+from faculty.artifacts import ARTIFACTS, frame_digest
+
+##############################################
+# On-demand exports
+#
+# Tabs no longer render a PDF / CSV on every rerun just to hand it to
+# st.download_button. export_button() is a two-step flow:
+#   1. "Prepare" submits the builder to a small worker pool and shows its
+#      progress while this rerun waits for it
+#   2. the finished bytes go to the artifact cache under
+#      (builder, DataFrame hash, arguments) and are served by a plain
+#      download button from then on
+# A rerun that does not ask for the file only hashes the DataFrame, and
+# an edited grade changes the hash, so the cache never serves an old file.
+# A job keeps running if the user navigates away and is picked up on return.
+#
+# A KeysetPager source has no content to hash until it is read, so it is
+# named by source_key (as for paging.paged_table) instead: its file is
+# built from the current data on every Prepare and is not cached; the
+# running job is remembered in the session only until it has been served.
+#
+# Builders take (df, *args, progress=callable) and return bytes or a
+# file-like object.
+##############################################
+
+EXPORT_WORKERS = int(os.getenv("FACULTY_EXPORT_WORKERS", "2"))
+POLL_S = 0.2
+
+_lock = threading.RLock()
+_executor = None
+_jobs = {}
+
+
+def export_key(build, df, *args):
+    return (getattr(build, "__qualname__", repr(build)), frame_digest(df)) + tuple(repr(a) for a in args)
+
+
+def _pool():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix="export")
+        return _executor
+
+
+def submit_export(key, build, df, *args):
+    # One job per key; a second request for the same file joins the first.
+    # key None: a one-off job whose bytes are not cached
+    job = {"progress": 0.0}
+
+    def set_progress(fraction):
+        job["progress"] = fraction
+
+    def run():
+        try:
+            data = build(df, *args, progress=set_progress)
+            data = data.getvalue() if hasattr(data, "getvalue") else data
+            data = data.encode("utf-8") if isinstance(data, str) else data
+            if key is not None:
+                ARTIFACTS.put(key, data)
+            return data
+        finally:
+            with _lock:
+                _jobs.pop(key, None)
+
+    if key is None:
+        job["future"] = _pool().submit(run)
+        return job
+    with _lock:
+        if key in _jobs:
+            return _jobs[key]
+        _jobs[key] = job
+        job["future"] = _pool().submit(run)
+    return job
+
+
+def _widget_key(key):
+    return "export-" + hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+
+
+def csv_bytes(df, progress=None):
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def export_button(label, build, df, *args, file_name, mime, prepare_label=None, source_key=None):
+    if source_key is None:
+        key = ("export",) + export_key(build, df, *args)
+        data = ARTIFACTS.get(key)
+        with _lock:
+            job = _jobs.get(key)
+    else:
+        key = ("export", getattr(build, "__qualname__", repr(build)), source_key) + tuple(repr(a) for a in args)
+        data = None
+    widget_key = _widget_key(key)
+    # The Prepare button owns widget_key; a paged export's job is kept beside it
+    job_key = widget_key + "-job"
+    if source_key is not None:
+        job = st.session_state.get(job_key)
+
+    if data is None:
+        if job is None and not st.button(prepare_label or f"⚙️ Prepare {file_name}", key=widget_key):
+            return
+        if job is None and source_key is None:
+            job = submit_export(key, build, df, *args)
+        elif job is None:
+            job = st.session_state[job_key] = submit_export(None, build, df, *args)
+
+        bar = st.progress(0.0, text="Generating file...")
+        while not wait([job["future"]], timeout=POLL_S).done:
+            bar.progress(job["progress"], text=f"Generating file... {job['progress']:.0%}")
+        bar.empty()
+
+        try:
+            data = job["future"].result()
+        except Exception as e:
+            st.error(f"❌ Could not generate {file_name}: {e}")
+            return
+        finally:
+            st.session_state.pop(job_key, None)
+
+    st.download_button(label=label, data=data, file_name=file_name, mime=mime, key=widget_key + "-download")
@@ -0,0 +1,160 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from pymongo.errors import PyMongoError
+
+##############################################
+# Freshness of data derived from new_grades / new_subjects
+#
+# student_semester_gpa and teacher_catalog are built from new_grades, and
+# the teacher keys are written into new_grades / new_subjects themselves,
+# but nothing that writes those collections stamps its documents, so a
+# store cannot ask which documents changed since its last run. Each build
+# instead records the token of the source collection it started from:
+#   count   estimated_document_count() (collection metadata)
+#   maxId   the largest _id (the _id index)
+# Both are index / metadata reads, cheap enough to check on the read path.
+#
+# ready()   True while the recorded token still matches new_grades and the
+#           last full rebuild is younger than twice the rebuild interval;
+#           readers fall back to the live query otherwise. Re-checked every
+#           READY_RECHECK_S either way, never latched.
+# plan()    what the background refresh should do:
+#             "insert"   the count grew by exactly the documents past the
+#                        recorded maxId: recompute what those touch
+#             "rebuild"  no build yet, documents were removed, or the last
+#                        rebuild is older than the rebuild interval - the
+#                        rebuild is what picks up grades edited in place,
+#                        which change neither count nor maxId
+#
+#   FACULTY_<STORE>_REFRESH_S   how often a process runs plan() (default 60;
+#                               0 turns the app-side refresh off)
+#   FACULTY_<STORE>_REBUILD_S   rebuild interval (default 900 unless the
+#                               store sets its own; 0 never rebuilds on age
+#                               and never expires a build)
+##############################################
+
+META_COLLECTION = "store_meta"
+
+READY_RECHECK_S = 15
+DEFAULT_REFRESH_S = 60
+DEFAULT_REBUILD_S = 900
+
+
+def collection_token(coll):
+    last = coll.find_one({}, {"_id": 1}, sort=[("_id", -1)]) or {}
+    return {"count": coll.estimated_document_count(), "maxId": last.get("_id")}
+
+
+def grades_token(db):
+    return collection_token(db["new_grades"])
+
+
+def _age_s(moment):
+    if moment is None:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - moment).total_seconds()
+
+
+class DerivedStore:
+    # Freshness state of data derived from the `source` collection; `env`
+    # is the variable prefix, e.g. "GPA" for FACULTY_GPA_REFRESH_S /
+    # FACULTY_GPA_REBUILD_S
+
+    def __init__(self, meta_id, env, label, source="new_grades", rebuild_s=DEFAULT_REBUILD_S):
+        self.meta_id = meta_id
+        self.env = env
+        self.label = label
+        self.source = source
+        self.rebuild_s = rebuild_s
+
+        self._lock = threading.Lock()
+        self._ready = {}
+        self._last_refresh = {}
+
+    def refresh_interval(self):
+        return float(os.getenv(f"FACULTY_{self.env}_REFRESH_S", DEFAULT_REFRESH_S))
+
+    def rebuild_interval(self):
+        return float(os.getenv(f"FACULTY_{self.env}_REBUILD_S", self.rebuild_s))
+
+    def token(self, db):
+        return collection_token(db[self.source])
+
+    def meta(self, db):
+        return db[META_COLLECTION].find_one({"_id": self.meta_id}) or {}
+
+    def record(self, db, token, rebuilt_at=None):
+        # After a build: the token it started from, and for a full rebuild
+        # its start time
+        fields = {"source": token, "refreshed_at": datetime.now(timezone.utc)}
+        if rebuilt_at is not None:
+            fields["rebuilt_at"] = rebuilt_at
+        db[META_COLLECTION].update_one({"_id": self.meta_id}, {"$set": fields}, upsert=True)
+        with self._lock:
+            self._ready.pop(db.name, None)
+
+    def _expired(self, meta, limit):
+        age = _age_s(meta.get("rebuilt_at"))
+        return limit > 0 and (age is None or age >= limit)
+
+    def ready(self, db):
+        now = time.monotonic()
+        with self._lock:
+            state = self._ready.get(db.name)
+        if state and now - state["checked_at"] < READY_RECHECK_S:
+            return state["ready"]
+
+        meta = self.meta(db)
+        ready = (meta.get("source") is not None and meta["source"] == self.token(db)
+                 and not self._expired(meta, 2 * self.rebuild_interval()))
+        with self._lock:
+            self._ready[db.name] = {"ready": ready, "checked_at": now}
+        return ready
+
+    def plan(self, db):
+        # (action, token, filter): action is None, "insert" (filter selects
+        # the inserted source documents) or "rebuild"
+        meta = self.meta(db)
+        token = self.token(db)
+        source = meta.get("source")
+        if source is None or self._expired(meta, self.rebuild_interval()):
+            return "rebuild", token, None
+        if source == token:
+            return None, token, None
+        if source["maxId"] is None or token["maxId"] is None:
+            return "rebuild", token, None
+
+        inserted = {"_id": {"$gt": source["maxId"], "$lte": token["maxId"]}}
+        added = token["count"] - source["count"]
+        if added > 0 and db[self.source].count_documents(inserted) == added:
+            return "insert", token, inserted
+        return "rebuild", token, None
+
+    def refresh_in_background(self, db, refresh):
+        # refresh(db) -> count of rows / teachers / students touched; at most
+        # one run per refresh interval per database
+        interval = self.refresh_interval()
+        if interval <= 0:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_refresh.get(db.name)
+            if last is not None and now - last < interval:
+                return
+            self._last_refresh[db.name] = now
+
+        def run():
+            try:
+                count = refresh(db)
+                if count:
+                    print(f"✅ Refreshed the {self.label} ({count})")
+            except PyMongoError as e:
+                print(f"❌ Could not refresh the {self.label}:", e)
+
+        threading.Thread(target=run, name=f"refresh-{self.meta_id}", daemon=True).start()
@@ -0,0 +1,71 @@
+import numpy as np
+
+##############################################
+# Percent grade -> 4.0 scale GPA
+#
+# The scale is a breakpoint table of (minimum percent, points), highest
+# first; grades below the last breakpoint (and missing grades) earn
+# DEFAULT_POINTS. The same table drives both evaluation strategies:
+#   gpa_points()       client-side, np.searchsorted over whole arrays
+#   gpa_switch_expr()  server-side, the equivalent MongoDB $switch
+##############################################
+
+GPA_SCALE = [
+    (97, 4.0),
+    (93, 4.0),
+    (90, 3.7),
+    (87, 3.3),
+    (83, 3.0),
+    (80, 2.7),
+    (77, 2.3),
+    (73, 2.0),
+    (70, 1.7),
+    (67, 1.3),
+    (65, 1.0),
+]
+DEFAULT_POINTS = 0.0
+
+
+def gpa_switch_expr(grade="$Grade", scale=GPA_SCALE, default=DEFAULT_POINTS):
+    return {
+        "$switch": {
+            "branches": [{"case": {"$gte": [grade, minimum]}, "then": points} for minimum, points in scale],
+            "default": default
+        }
+    }
+
+
+def gpa_points(grades, scale=GPA_SCALE, default=DEFAULT_POINTS):
+    grades = np.asarray(grades, dtype=float)
+    thresholds = np.array([minimum for minimum, _ in reversed(scale)], dtype=float)
+    points = np.array([p for _, p in reversed(scale)] + [default], dtype=float)
+
+    # index of the highest breakpoint <= grade; -1 (-> default) below the scale
+    idx = np.searchsorted(thresholds, grades, side="right") - 1
+    idx = np.where((idx < 0) | np.isnan(grades), len(thresholds), idx)
+    return points[idx]
+
+
+def semester_gpa(frame, keys, points_col="GPApoint", units_col="Units"):
+    # Unit-weighted GPA per group of `keys`, as grouped NumPy sums.
+    # Missing units / points contribute nothing, like $sum over nulls.
+    codes = frame.groupby(keys, sort=False).ngroup().to_numpy()
+    keep = ~np.isnan(codes)   # rows with a null key belong to no group
+    codes = codes[keep].astype(np.int64)
+    groups = frame.loc[keep, keys].drop_duplicates().reset_index(drop=True)
+
+    points = frame[points_col].to_numpy(dtype=float)[keep]
+    units = frame[units_col].to_numpy(dtype=float)[keep]
+    weighted = np.nan_to_num(points * units)
+
+    total_weighted = np.bincount(codes, weights=weighted, minlength=len(groups))
+    total_units = np.bincount(codes, weights=np.nan_to_num(units), minlength=len(groups))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gpa = np.where(total_units > 0, np.round(total_weighted / total_units, 2), np.nan)
+
+    result = groups
+    result["totalWeighted"] = total_weighted
+    result["totalUnits"] = total_units
+    result["GPA"] = gpa
+    return result
@@ -0,0 +1,167 @@
+import argparse
+import sys
+from datetime import datetime, timezone
+
+from faculty.db import get_database
+from faculty.freshness import DerivedStore, grades_token
+from faculty.gpa import gpa_switch_expr
+
+##############################################
+# Student semester GPA store
+#
+# student_semester_gpa holds one document per (StudentID, SemesterID) with
+# the unit-weighted GPA the YearLevel tracker displays, so the tab reads a
+# narrow indexed collection instead of re-joining every grade document.
+#
+#   _id               {"StudentID": ..., "SemesterID": ...}
+#   StudentID, SemesterID, totalWeighted, totalUnits, GPA, RefreshedAt
+#
+# Refresh paths (see faculty.freshness):
+#   rebuild_semester_gpa()   full rebuild with $out
+#   refresh_students()       recompute every semester of the given students
+#   refresh_changed()        the students of newly inserted grade documents,
+#                            or a full rebuild when the source changed in
+#                            any other way or the last rebuild is too old
+# Readers use the store only while store_ready(); otherwise the tracker
+# runs the live pipeline.
+##############################################
+
+STORE_COLLECTION = "student_semester_gpa"
+STORE = DerivedStore("student_semester_gpa", env="GPA", label="semester GPA store")
+
+CHUNK_SIZE = 1000
+
+
+def semester_gpa_pipeline(grade_filter=None, refreshed_at=None):
+    pipeline = []
+    if grade_filter:
+        pipeline.append({"$match": grade_filter})
+
+    pipeline += [
+        # One row per array position
+        {"$unwind": {"path": "$SubjectCodes", "includeArrayIndex": "idx"}},
+        {
+            "$project": {
+                "StudentID": 1,
+                "SemesterID": 1,
+                "SubjectCode": "$SubjectCodes",
+                "Grade": {"$arrayElemAt": ["$Grades", "$idx"]}
+            }
+        },
+
+        # Units come from the subject; unknown subjects are dropped
+        {
+            "$lookup": {
+                "from": "new_subjects",
+                "localField": "SubjectCode",
+                "foreignField": "_id",
+                "as": "SubjectInfo"
+            }
+        },
+        {"$unwind": "$SubjectInfo"},
+        {
+            "$project": {
+                "StudentID": 1,
+                "SemesterID": 1,
+                "units": "$SubjectInfo.Units",
+                "weightedGrade": {"$multiply": [gpa_switch_expr(), "$SubjectInfo.Units"]}
+            }
+        },
+
+        # GPA per student per semester
+        {
+            "$group": {
+                "_id": {"StudentID": "$StudentID", "SemesterID": "$SemesterID"},
+                "totalWeighted": {"$sum": "$weightedGrade"},
+                "totalUnits": {"$sum": "$units"}
+            }
+        },
+        {
+            "$set": {
+                "StudentID": "$_id.StudentID",
+                "SemesterID": "$_id.SemesterID",
+                "GPA": {
+                    "$cond": [
+                        {"$gt": ["$totalUnits", 0]},
+                        {"$round": [{"$divide": ["$totalWeighted", "$totalUnits"]}, 2]},
+                        None
+                    ]
+                },
+                "RefreshedAt": refreshed_at or "$$NOW"
+            }
+        }
+    ]
+    return pipeline
+
+
+def rebuild_semester_gpa(db):
+    token, started = grades_token(db), datetime.now(timezone.utc)
+    db["new_grades"].aggregate(semester_gpa_pipeline() + [{"$out": STORE_COLLECTION}])
+    STORE.record(db, token, rebuilt_at=started)
+    return db[STORE_COLLECTION].estimated_document_count()
+
+
+def refresh_students(db, student_ids):
+    # Recompute whole students: a changed grade document can move, add or
+    # drop semesters, and a student's documents are few. $merge replaces
+    # rows in place, then only the rows this run did not write (semesters a
+    # student no longer has) are removed, so readers see the old or the new
+    # rows but never none.
+    student_ids = list(student_ids)
+    store = db[STORE_COLLECTION]
+    refreshed_at = datetime.now(timezone.utc)
+
+    for start in range(0, len(student_ids), CHUNK_SIZE):
+        chunk = student_ids[start:start + CHUNK_SIZE]
+        db["new_grades"].aggregate(semester_gpa_pipeline({"StudentID": {"$in": chunk}}, refreshed_at) + [{
+            "$merge": {
+                "into": STORE_COLLECTION,
+                "on": "_id",
+                "whenMatched": "replace",
+                "whenNotMatched": "insert"
+            }
+        }])
+        store.delete_many({"StudentID": {"$in": chunk}, "RefreshedAt": {"$ne": refreshed_at}})
+    return len(student_ids)
+
+
+def refresh_changed(db):
+    action, token, inserted = STORE.plan(db)
+    if action == "rebuild":
+        return rebuild_semester_gpa(db)
+    if action == "insert":
+        count = refresh_students(db, db["new_grades"].distinct("StudentID", inserted))
+        STORE.record(db, token)
+        return count
+    return 0
+
+
+def store_ready(db):
+    # True while the store matches new_grades (faculty.freshness)
+    return STORE.ready(db)
+
+
+def refresh_in_background(db):
+    STORE.refresh_in_background(db, refresh_changed)
+
+
+##############################################
+# CLI: python -m faculty.gpa_store [--rebuild]
+##############################################
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the student_semester_gpa collection.")
+    parser.add_argument("--uri", help="MongoDB URI (defaults to MONGODB_URI)")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild every row from new_grades")
+    args = parser.parse_args(argv)
+
+    db = get_database(args.uri)
+    if args.rebuild:
+        print(f"✅ Rebuilt {rebuild_semester_gpa(db)} semester GPA row(s)")
+    else:
+        print(f"✅ Refreshed the store: {refresh_changed(db)} student(s) or row(s) recomputed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
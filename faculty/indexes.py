@@ -0,0 +1,272 @@
+import argparse
+import os
+import sys
+import threading
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+from faculty import queries
+from faculty.db import get_database
+from faculty.teachers import TEACHER_COLLATION
+
+##############################################
+# Required indexes
+#
+# One entry per hot filter the app issues. new_grades stores parallel
+# arrays, and MongoDB refuses compound indexes over two array fields of the
+# same document, so SubjectCodes and Teachers get separate multikey indexes.
+##############################################
+
+INDEXES = {
+    "new_grades": [
+        # Teacher dashboards: {"Teachers": t} and {"Teachers": t, "SemesterID": s}
+        IndexModel([("Teachers", ASCENDING), ("SemesterID", ASCENDING)], name="teachers_semester"),
+        # Progress tracker: {"StudentID": id} / {"StudentID": {"$in": [...]}}
+        IndexModel([("StudentID", ASCENDING), ("SemesterID", ASCENDING)], name="student_semester"),
+        # Subject lookups: {"SubjectCodes": code, ...}
+        IndexModel([("SubjectCodes", ASCENDING)], name="subject_codes"),
+        # Normalized teacher key: {"TeacherKeys": key}
+        IndexModel([("TeacherKeys", ASCENDING), ("SemesterID", ASCENDING)], name="teacher_keys_semester"),
+        # Case-insensitive fallback until TeacherKeys is backfilled
+        IndexModel([("Teachers", ASCENDING)], name="teachers_ci", collation=TEACHER_COLLATION),
+        # Batch reports: {"SemesterID": s}
+        IndexModel([("SemesterID", ASCENDING)], name="semester"),
+    ],
+    "student_semester_gpa": [
+        # YearLevel tracker: {"StudentID": {"$in": cohort}}
+        IndexModel([("StudentID", ASCENDING), ("SemesterID", ASCENDING)], name="student_semester"),
+    ],
+    "new_subjects": [
+        IndexModel([("TeacherKey", ASCENDING)], name="teacher_key"),
+        IndexModel([("Teacher", ASCENDING)], name="teacher_ci", collation=TEACHER_COLLATION),
+    ],
+    "new_students": [
+        # YearLevel tracker pages: {"YearLevel": y, "_id": {"$gt": after}} sorted by _id
+        IndexModel([("YearLevel", ASCENDING), ("_id", ASCENDING)], name="year_level_id"),
+        IndexModel([("Course", ASCENDING)], name="course"),
+    ],
+    "new_semesters": [
+        IndexModel([("SchoolYear", ASCENDING), ("Semester", ASCENDING)], name="school_year_semester"),
+    ],
+}
+
+
+def _key(spec, collation=None):
+    key = tuple((field, int(direction) if isinstance(direction, (int, float)) else direction)
+                for field, direction in spec)
+    collation = collation or {}
+    return key, collation.get("locale"), collation.get("strength")
+
+
+def missing_indexes(db):
+    missing = {}
+    for coll_name, models in INDEXES.items():
+        existing = {
+            _key(info["key"], info.get("collation"))
+            for info in db[coll_name].index_information().values()
+        }
+        todo = [
+            m for m in models
+            if _key(m.document["key"].items(), m.document.get("collation")) not in existing
+        ]
+        if todo:
+            missing[coll_name] = todo
+    return missing
+
+
+def ensure_indexes(db):
+    created = []
+    for coll_name, models in missing_indexes(db).items():
+        created += [f"{coll_name}.{name}" for name in db[coll_name].create_indexes(models)]
+    return created
+
+
+_ensure_lock = threading.Lock()
+_ensure_started = False
+
+
+def ensure_indexes_in_background(db):
+    # Runs once per process; index builds never block a rerun
+    global _ensure_started
+    if os.getenv("FACULTY_ENSURE_INDEXES", "1") == "0":
+        return
+
+    with _ensure_lock:
+        if _ensure_started:
+            return
+        _ensure_started = True
+
+    def run():
+        try:
+            created = ensure_indexes(db)
+            if created:
+                print("✅ Created indexes:", ", ".join(created))
+        except PyMongoError as e:
+            print("❌ Could not ensure indexes:", e)
+
+    threading.Thread(target=run, name="ensure-indexes", daemon=True).start()
+
+
+##############################################
+# Query verification
+#
+# Every named query in faculty.queries is explained with sample parameters
+# and any winning plan containing a COLLSCAN is flagged, so a new or edited
+# pipeline that regresses to a full scan fails the check. Known full scans
+# must say why through allow_collscan.
+##############################################
+
+def sample_params(db):
+    # Real values where the data has them, so the planner sees realistic bounds
+    grade = db["new_grades"].find_one({}, {"StudentID": 1, "SemesterID": 1, "SubjectCodes": 1, "Teachers": 1}) or {}
+    student = db["new_students"].find_one({}, {"YearLevel": 1}) or {}
+    semester = db["new_semesters"].find_one({}, {"Semester": 1, "SchoolYear": 1}) or {}
+
+    return {
+        "teacher": (grade.get("Teachers") or [""])[0] or "",
+        "subject_code": (grade.get("SubjectCodes") or [""])[0],
+        "semester_id": grade.get("SemesterID", 0),
+        "student_id": grade.get("StudentID", 0),
+        "year_level": student.get("YearLevel", 1),
+        "semester": semester.get("Semester", ""),
+        "school_year": semester.get("SchoolYear", ""),
+        "student_ids": [grade.get("StudentID", 0)],
+    }
+
+
+def explain_query(db, query, params):
+    spec = queries.build_spec(db, query["name"], *[params[name] for name in query["sample"]])
+    coll_name = query["collection"]
+
+    if query["kind"] == "find":
+        cmd = {"find": coll_name, "filter": spec.get("filter", {})}
+        if query["projection"]:
+            cmd["projection"] = query["projection"]
+        if spec.get("sort"):
+            cmd["sort"] = dict(spec["sort"])
+        if spec.get("limit"):
+            cmd["limit"] = spec["limit"]
+    elif query["kind"] == "aggregate":
+        cmd = {"aggregate": coll_name, "pipeline": spec["pipeline"], "cursor": {}}
+    elif query["kind"] == "distinct":
+        cmd = {"distinct": coll_name, "key": spec["key"], "query": spec.get("filter", {})}
+    else:
+        raise ValueError(f"Unknown query kind: {query['kind']}")
+
+    if spec.get("collation") is not None:
+        cmd["collation"] = spec["collation"].document
+
+    return db.command("explain", cmd, verbosity="queryPlanner")
+
+
+def plan_stages(explain, found=None):
+    # Stage names of the winning plan(s), depth first
+    if found is None:
+        found = []
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "rejectedPlans":
+                continue
+            if key == "stage" and isinstance(value, str):
+                found.append(value)
+            else:
+                plan_stages(value, found)
+    elif isinstance(explain, list):
+        for item in explain:
+            plan_stages(item, found)
+    return found
+
+
+def examined_counts(explain, totals=None):
+    # (keys examined, documents examined) summed over every executionStats
+    # section and $lookup stage of an explain with executionStats verbosity
+    if totals is None:
+        totals = [0, 0]
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "rejectedPlans":
+                continue
+            if key == "totalKeysExamined" and isinstance(value, int):
+                totals[0] += value
+            elif key == "totalDocsExamined" and isinstance(value, int):
+                totals[1] += value
+            else:
+                examined_counts(value, totals)
+    elif isinstance(explain, list):
+        for item in explain:
+            examined_counts(item, totals)
+    return tuple(totals)
+
+
+def returned_count(explain):
+    # Documents an aggregate explain with executionStats verbosity says the
+    # pipeline returned: the last stage's nReturned, or the query layer's
+    # when the whole pipeline ran there; summed over shards
+    if "shards" in explain:
+        return sum(returned_count(shard) for shard in explain["shards"].values())
+    stages = explain.get("stages")
+    if stages:
+        last = stages[-1]
+        if "nReturned" in last:
+            return last["nReturned"]
+        explain = last.get("$cursor", {})
+    return explain.get("executionStats", {}).get("nReturned", 0)
+
+
+def verify_queries(db, params=None):
+    params = params or sample_params(db)
+    results = []
+    for query in queries.QUERIES.values():
+        stages = plan_stages(explain_query(db, query, params))
+        collscan = "COLLSCAN" in stages
+        results.append({
+            "name": query["name"],
+            "collection": query["collection"],
+            "stages": stages,
+            "collscan": collscan,
+            "allowed": query["allow_collscan"],
+            "ok": not collscan or bool(query["allow_collscan"]),
+        })
+    return results
+
+
+##############################################
+# CLI: python -m faculty.indexes [--verify] [--no-create]
+##############################################
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create and verify the Faculty Module indexes.")
+    parser.add_argument("--uri", help="MongoDB URI (defaults to MONGODB_URI)")
+    parser.add_argument("--no-create", action="store_true", help="only report missing indexes")
+    parser.add_argument("--verify", action="store_true", help="explain every registered query and fail on COLLSCAN")
+    args = parser.parse_args(argv)
+
+    db = get_database(args.uri)
+    failed = False
+
+    if args.no_create:
+        for coll_name, models in missing_indexes(db).items():
+            for model in models:
+                print(f"❌ missing {coll_name}.{model.document['name']}")
+                failed = True
+    else:
+        created = ensure_indexes(db)
+        print(f"✅ Created {len(created)} index(es)" + (": " + ", ".join(created) if created else ""))
+
+    if args.verify:
+        for result in verify_queries(db):
+            plan = " > ".join(result["stages"])
+            if not result["collscan"]:
+                print(f"✅ {result['name']}: {plan}")
+            elif result["allowed"]:
+                print(f"⚠️ {result['name']}: {plan} (allowed: {result['allowed']})")
+            else:
+                print(f"❌ {result['name']}: {plan}")
+                failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
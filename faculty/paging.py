@@ -0,0 +1,125 @@
+import hashlib
+import os
+from io import BytesIO
+
+import pandas as pd
+import streamlit as st
+
+##############################################
+# Keyset-paged result tables
+#
+# The Student Progress Tracker, Custom Query Builder and Intervention
+# tabs used to read their whole result into one DataFrame. A KeysetPager
+# reads it a page at a time in _id order. Each page is one indexed query
+# for the documents after the previous page's last key, plus $limit.
+# Offsets are never skipped over.
+#
+#   paged_table()   shows the current page with Previous / Next buttons and
+#                   an estimated total; only the page start keys live in
+#                   session state, so a session holds one page of rows
+#   stream_csv()    an exports builder that walks every page and writes
+#                   each page's CSV as it goes; only the CSV text is kept
+#
+# FACULTY_PAGE_SIZE sets the rows per page (default 500; 0 reads the whole
+# result as one page, the old behaviour).
+##############################################
+
+DEFAULT_PAGE_SIZE = 500
+EXPORT_PAGE_SIZE = 5000
+
+
+def page_size():
+    return int(os.getenv("FACULTY_PAGE_SIZE", DEFAULT_PAGE_SIZE)) or None
+
+
+class KeysetPager:
+    # fetch_page(after, limit) -> (DataFrame, key to continue after or None
+    # on the last page); limit=None reads everything. count() estimates the
+    # total rows; columns, when set, is the fixed column order of an export.
+
+    def __init__(self, fetch_page, count=None, label="rows", columns=None, size=None):
+        self.fetch_page = fetch_page
+        self.count = count
+        self.label = label
+        self.columns = columns
+        self.size = size if size is not None else page_size()
+
+    def page(self, after=None, limit=None):
+        return self.fetch_page(after, limit or self.size)
+
+    def pages(self, limit=None):
+        after = None
+        while True:
+            df, after = self.page(after, limit)
+            yield df
+            if after is None:
+                return
+
+    def read_all(self, limit=EXPORT_PAGE_SIZE):
+        # Every page in one DataFrame, for exports whose result is small
+        # next to what is read (e.g. only the at-risk rows)
+        return pd.concat(list(self.pages(limit)), ignore_index=True)
+
+
+def _previous(state):
+    state["index"] = max(state["index"] - 1, 0)
+
+
+def _next(state):
+    if state["next"] is not None:
+        del state["starts"][state["index"] + 1:]
+        del state["offsets"][state["index"] + 1:]
+        state["starts"].append(state["next"])
+        state["offsets"].append(state["offsets"][state["index"]] + state["rows"])
+        state["index"] += 1
+
+
+def paged_table(pager, key, show=None):
+    # key identifies the result (query name and arguments); a new key starts
+    # at the first page. show(df) displays the page (st.dataframe by default).
+    # Returns the page, or None (and shows nothing) when the result is empty.
+    widget_key = "pager-" + hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+    state = st.session_state.setdefault(widget_key, {
+        "starts": [None], "offsets": [0], "index": 0, "next": None, "rows": 0, "total": None,
+    })
+    if state["total"] is None and pager.count is not None:
+        state["total"] = pager.count()
+
+    df, state["next"] = pager.page(state["starts"][state["index"]])
+    state["rows"] = len(df)
+    if df.empty and not state["index"] and state["next"] is None:
+        return None
+    (show or st.dataframe)(df)
+
+    first = state["offsets"][state["index"]]
+    caption = f"Page {state['index'] + 1}"
+    if len(df):
+        caption += f" · rows {first + 1:,}–{first + len(df):,}"
+    if state["total"] is not None:
+        caption += f" · about {state['total']:,} {pager.label} in total"
+
+    if state["index"] or state["next"] is not None:
+        col1, col2, col3 = st.columns([1, 1, 6])
+        col1.button("◀ Previous", key=widget_key + "-previous", disabled=not state["index"],
+                    on_click=_previous, args=(state,))
+        col2.button("Next ▶", key=widget_key + "-next", disabled=state["next"] is None,
+                    on_click=_next, args=(state,))
+        col3.caption(caption)
+    else:
+        st.caption(caption)
+    return df
+
+
+def stream_csv(pager, progress=None):
+    # exports builder: every page, EXPORT_PAGE_SIZE rows per query
+    total = pager.count() if pager.count is not None else None
+    buffer = BytesIO()
+    written = 0
+    for number, df in enumerate(pager.pages(EXPORT_PAGE_SIZE)):
+        if pager.columns is not None:
+            df = df.reindex(columns=pager.columns)
+        buffer.write(df.to_csv(index=False, header=number == 0).encode("utf-8"))
+        written += len(df)
+        if progress is not None and total:
+            progress(min(written / total, 1.0))
+    return buffer
@@ -0,0 +1,54 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+##############################################
+# Parallel reads within a rerun
+#
+# A tab's independent reads are issued together and joined, so over a
+# high-latency link the tab waits for the slowest round trip rather than
+# their sum. Examples are a query and the dimension maps it is joined
+# with, or two lists shown side by side. The MongoClient is thread-safe and
+# pooled (db.py), and the dimension cache locks per dimension.
+#
+#   subjects, semesters = parallel.gather(
+#       (queries.fetch, db, "subjects.by_teacher", teacher),
+#       (dimensions.semesters, db),
+#   )
+#
+# Every call runs in a copy of the caller's contextvars context, so
+# per-rerun context follows it onto the worker thread. Calls must not use
+# st.*, since worker threads have no script run context.
+##############################################
+
+QUERY_WORKERS = int(os.getenv("FACULTY_QUERY_WORKERS", "8"))
+
+_lock = threading.Lock()
+_executor = None
+
+
+def _pool():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="query")
+        return _executor
+
+
+def submit(fn, *args, **kwargs):
+    # Future of fn(*args, **kwargs), run in a copy of the current context
+    context = contextvars.copy_context()
+    return _pool().submit(context.run, fn, *args, **kwargs)
+
+
+def gather(*calls):
+    # calls: (fn, *args) tuples; returns their results in order. The first
+    # call runs on this thread while the rest run on the pool; the first
+    # exception (in call order) is re-raised.
+    if not calls:
+        return []
+    first, rest = calls[0], calls[1:]
+    futures = [submit(*call) for call in rest]
+    results = [first[0](*first[1:])]
+    return results + [future.result() for future in futures]
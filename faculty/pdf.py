@@ -0,0 +1,219 @@
+from io import BytesIO
+
+from faculty import telemetry
+
+##############################################
+# PDF reports
+#
+# Every report is a title block followed by one DataFrame table, drawn by
+# render_report():
+#   - cells are stringified in one NumPy pass (what Table would str() per
+#     cell at draw time)
+#   - zebra striping is a single ROWBACKGROUNDS command, not one
+#     BACKGROUND / setStyle per row
+#   - rows have a fixed height, so the table is cut into page-sized
+#     LongTables up front and platypus never re-splits (and re-styles) the
+#     remainder of a long table page after page
+#   - the header row repeats on every page
+#
+# reportlab is imported on the first render, not when the module is
+# loaded, so the app starts without it. Colors are reportlab Colors or
+# anything colors.toColor() accepts ("#1976d2", "whitesmoke"); page sizes
+# are a (width, height) tuple or a reportlab.lib.pagesizes name.
+##############################################
+
+FRAME_PADDING = 6     # SimpleDocTemplate's Frame padding, each side
+LEADING = 12          # reportlab's default cell leading (FONTSIZE leaves it alone)
+CELL_PADDING = 3      # default TOPPADDING / BOTTOMPADDING
+
+_styles = None
+
+
+def _stylesheet():
+    global _styles
+    if _styles is None:
+        from reportlab.lib.styles import getSampleStyleSheet
+        _styles = getSampleStyleSheet()
+    return _styles
+
+
+def _color(value):
+    from reportlab.lib import colors
+    return None if value is None else colors.toColor(value)
+
+
+def _page_size(pagesize, landscape=False):
+    from reportlab.lib import pagesizes
+    size = getattr(pagesizes, pagesize) if isinstance(pagesize, str) else pagesize
+    return pagesizes.landscape(size) if landscape else size
+
+
+def format_cells(dataframe):
+    # Header + body as lists of str
+    body = dataframe.to_numpy().astype(str).tolist() if len(dataframe.columns) else []
+    return [[str(c) for c in dataframe.columns]] + body
+
+
+def _block_height(flowables, width, height):
+    # Height the title block takes at the top of a page (the frame drops
+    # the first flowable's spaceBefore)
+    total = 0
+    for i, flowable in enumerate(flowables):
+        _, h = flowable.wrap(width, height)
+        total += h + flowable.getSpaceAfter() + (flowable.getSpaceBefore() if i else 0)
+    return total
+
+
+def table_chunks(data, col_widths, style, stripes, row_height, header_height, first_height, page_height):
+    # LongTables of at most one page each; the stripe cycle is rotated so it
+    # continues across chunks
+    from reportlab.platypus import LongTable
+
+    header, body = data[0], data[1:]
+    per_page = max(1, int((page_height - header_height) // row_height))
+    first = max(0, int((first_height - header_height) // row_height))
+    sizes = [first] if first else []
+
+    tables = []
+    start = 0
+    while start < len(body) or not tables:
+        size = sizes.pop(0) if sizes else per_page
+        rows = body[start:start + size]
+        offset = start % len(stripes)
+        commands = list(style) + [("ROWBACKGROUNDS", (0, 1), (-1, -1), stripes[offset:] + stripes[:offset])]
+        tables.append(LongTable(
+            [header] + rows,
+            colWidths=col_widths,
+            rowHeights=[header_height] + [row_height] * len(rows),
+            repeatRows=1,
+            style=commands,
+        ))
+        start += size
+    return tables
+
+
+def render_report(dataframe, title, subtitle=None, pagesize="A4", landscape=False, margins=(30, 30, 30, 30),
+                  header_color="#1976d2", header_text="white",
+                  header_font="Helvetica-Bold", header_font_size=None, font_size=9,
+                  header_padding=10, grid_width=0.5, stripes=("lightgrey", "whitesmoke"),
+                  col_widths=None, empty_message=None, title_style="Heading1", progress=None):
+    # header_font_size=None keeps the body size for the header too;
+    # col_widths="fit" spreads the page width evenly; progress(fraction) is
+    # called as flowables (about one per page) are laid out
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    left, right, top, bottom = margins
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=_page_size(pagesize, landscape),
+                            leftMargin=left, rightMargin=right, topMargin=top, bottomMargin=bottom)
+
+    styles = _stylesheet()
+    elements = [Paragraph(title, styles[title_style])]
+    if subtitle:
+        elements.append(Paragraph(subtitle, styles["Heading3"]))
+    elements.append(Spacer(1, 12))  # add some space before the table
+
+    if dataframe.empty and empty_message:
+        elements.append(Paragraph(empty_message, styles["Normal"]))
+    else:
+        data = format_cells(dataframe)
+        if col_widths == "fit":
+            col_widths = [doc.width / len(data[0])] * len(data[0])
+
+        header_size = header_font_size or font_size
+        style = [
+            ("BACKGROUND", (0, 0), (-1, 0), _color(header_color)),
+            ("TEXTCOLOR", (0, 0), (-1, 0), _color(header_text)),
+            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+            ("FONTNAME", (0, 0), (-1, 0), header_font),
+            ("FONTSIZE", (0, 0), (-1, 0), header_size),
+            ("FONTSIZE", (0, 1), (-1, -1), font_size),
+            ("BOTTOMPADDING", (0, 0), (-1, 0), header_padding),
+            ("GRID", (0, 0), (-1, -1), grid_width, _color("grey")),
+        ]
+
+        page_height = doc.height - 2 * FRAME_PADDING
+        elements += table_chunks(
+            data, col_widths, style, [_color(stripe) for stripe in stripes],
+            row_height=LEADING + 2 * CELL_PADDING,
+            header_height=LEADING + CELL_PADDING + header_padding,
+            first_height=page_height - _block_height(elements, doc.width, page_height),
+            page_height=page_height,
+        )
+
+    if progress is not None:
+        doc.setProgressCallBack(_progress_callback(progress))
+    with telemetry.span("pdf.build"):
+        doc.build(elements)
+    buffer.seek(0)
+    return buffer
+
+
+def _progress_callback(progress):
+    total = [1]
+
+    def on_progress(kind, value):
+        if kind == "SIZE_EST":
+            total[0] = max(value, 1)
+        elif kind == "PROGRESS":
+            progress(min(value / total[0], 1.0))
+
+    return on_progress
+
+
+##############################################
+# Reports
+##############################################
+
+def df_to_pdf(dataframe, title="Grade Distribution Report", subtitle=None, progress=None):
+    return render_report(
+        dataframe, title, subtitle,
+        pagesize="letter", landscape=True,
+        header_color="black", header_text="whitesmoke",
+        progress=progress,
+    )
+
+
+def df_to_pdf_tracker(dataframe, title="Student Progress Report", subtitle=None, progress=None):
+    # Auto-fit columns (equal widths)
+    return render_report(
+        dataframe, title, subtitle,
+        pagesize="letter", landscape=True, margins=(20, 20, 30, 30),
+        header_text="whitesmoke", col_widths="fit",
+        progress=progress,
+    )
+
+
+def generate_pdf_heatmap(df, teacher_name, progress=None):
+    return render_report(
+        df, "Subject Difficulty Heatmap", f"Performance Summary for {teacher_name}",
+        header_padding=9, grid_width=0.25, stripes=(None,),
+        progress=progress,
+    )
+
+
+def generate_pdf_intervention(df, teacher_name, progress=None):
+    return render_report(
+        df, "Intervention Candidates List", f"Student Performance For {teacher_name}",
+        header_font="Helvetica", header_font_size=10, font_size=8,
+        header_padding=9, grid_width=0.25, stripes=(None, "whitesmoke"),
+        col_widths=[50, 100, 80, 100, 50, 50, 100],  # widths in points for each column
+        empty_message="No students found at risk.",
+        progress=progress,
+    )
+
+
+def generate_pdf_submission(summary_df, teacher_name, progress=None):
+    if summary_df.empty:
+        return render_report(
+            summary_df, f"📑 Grade Submission Summary for {teacher_name}",
+            title_style="Title", empty_message="No records found.",
+            progress=progress,
+        )
+    return render_report(
+        summary_df, "Grade Submission Summary", f"For {teacher_name}",
+        header_font_size=10, font_size=8,
+        header_padding=9, grid_width=0.25, stripes=(None, "whitesmoke"),
+        col_widths=[50, 80, 100, 50, 50, 50, 50],  # widths in points for each column
+        progress=progress,
+    )
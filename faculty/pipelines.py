@@ -0,0 +1,714 @@
+from faculty.gpa import gpa_switch_expr
+from faculty.teachers import collated_names, teacher_key
+
+# Grade ranges shared by the distribution pipeline and its pd.cut fallback
+GRADE_BINS = [0, 74, 79, 84, 89, 94, 100]
+GRADE_LABELS = ["Below 75", "75-79", "80-84", "85-89", "90-94", "95-100"]
+NO_GRADE = "No Grade"
+
+
+def teacher_subjects_with_semester_pipeline(teacher_name, by_key=True):
+    # by_key=False is the pre-backfill form; run it with TEACHER_COLLATION
+    if by_key:
+        key = teacher_key(teacher_name)
+        doc_match = {"TeacherKeys": key}
+        row_match = {"TeacherKey": key}
+    else:
+        names = collated_names(teacher_name)
+        doc_match = {"Teachers": {"$in": names}}
+        row_match = {"Teacher": {"$in": names}}
+
+    pipeline = [
+        # Only grade documents that involve this teacher (indexed equality)
+        {"$match": doc_match},
+        # Unwind SubjectCodes with index to align with Grades and Teachers
+        {
+            "$unwind": {
+                "path": "$SubjectCodes",
+                "includeArrayIndex": "idx"
+            }
+        },
+        # Align Grades and Teachers by index
+        {
+            "$project": {
+                "SubjectCode": "$SubjectCodes",
+                "Teacher": { "$arrayElemAt": ["$Teachers", "$idx"] },
+                "TeacherKey": { "$arrayElemAt": ["$TeacherKeys", "$idx"] },
+                "SemesterID": 1
+            }
+        },
+        # Keep only the subjects this teacher handles
+        {"$match": row_match},
+        # Lookup semester info from 'semesters' collection
+        {
+            "$lookup": {
+                "from": "new_semesters",
+                "localField": "SemesterID",
+                "foreignField": "_id",
+                "as": "sem_info"
+            }
+        },
+        { "$unwind": "$sem_info" },
+        # Final projection
+        {
+            "$project": {
+                "_id": 0,
+                "SubjectCode": 1,
+                "Teacher": 1,
+                "SchoolYear": "$sem_info.SchoolYear",
+                "Semester": "$sem_info.Semester"
+            }
+        },
+        # Optional: Remove duplicates
+        {
+            "$group": {
+                "_id": {
+                    "SubjectCode": "$SubjectCode",
+                    "Teacher": "$Teacher",
+                    "SchoolYear": "$SchoolYear",
+                    "Semester": "$Semester"
+                }
+            }
+        },
+        # Flatten group output
+        {
+            "$project": {
+                "_id": 0,
+                "SubjectCode": "$_id.SubjectCode",
+                "Teacher": "$_id.Teacher",
+                "SchoolYear": "$_id.SchoolYear",
+                "Semester": "$_id.Semester"
+            }
+        },
+        # Optional: sort results
+        {
+            "$sort": {
+                "SchoolYear": 1,
+                "Semester": 1,
+                "SubjectCode": 1
+            }
+        }
+    ]
+    return pipeline
+
+
+def student_grades_by_subject_teacher_pipeline(subject_code, teacher_name, semester_id):
+    pipeline = [
+        {
+            "$match": {
+                "SubjectCodes": subject_code,
+                "Teachers": teacher_name,
+                "SemesterID": semester_id
+            }
+        },
+        {
+            "$project": {
+                "StudentID": 1,
+                "SubjectIndex": { "$indexOfArray": ["$SubjectCodes", subject_code] },
+                "Grades": 1,
+                "Teachers": 1
+            }
+        },
+        {
+            "$project": {
+                "StudentID": 1,
+                "Grade": { "$arrayElemAt": ["$Grades", "$SubjectIndex"] }
+            }
+        },
+        {
+            "$lookup": {
+                "from": "new_students",
+                "localField": "StudentID",
+                "foreignField": "_id",
+                "as": "student_info"
+            }
+        },
+        {
+            "$unwind": "$student_info"
+        },
+        {
+            "$project": {
+                "_id": 1,
+                "Name": "$student_info.Name",
+                "Course" : "$student_info.Course",
+                "YearLevel" : "$student_info.YearLevel",
+                "Grade": 1
+            }
+        }
+    ]
+    return pipeline
+
+
+def year_level_progress_pipeline(year_level, student_ids=None):
+    # student_ids: the cohort resolved from new_students, matched on the
+    # StudentID index before any join. Without it every grade document is
+    # joined and filtered afterwards.
+    pipeline = [{"$match": {"StudentID": {"$in": list(student_ids)}}}] if student_ids is not None else []
+
+    pipeline += [
+        # --- Step 1: Join grades → students (filter by YearLevel) ---
+        {
+            "$lookup": {
+                "from": "new_students",
+                "localField": "StudentID",
+                "foreignField": "_id",
+                "as": "StudentInfo"
+            }
+        },
+        {"$unwind": "$StudentInfo"},
+        {"$match": {"StudentInfo.YearLevel": year_level}},
+
+        # --- Step 2: Unwind arrays ---
+        {"$unwind": {"path": "$SubjectCodes", "includeArrayIndex": "idx"}},
+
+        # --- Step 3: Align subject, grade, teacher ---
+        {
+            "$project": {
+                "StudentID": 1,
+                "SemesterID": 1,
+                "SubjectCode": "$SubjectCodes",
+                "Grade": {"$arrayElemAt": ["$Grades", "$idx"]},
+                "Teacher": {"$arrayElemAt": ["$Teachers", "$idx"]},
+                "Name": "$StudentInfo.Name",
+                "Course": "$StudentInfo.Course",
+                "YearLevel": "$StudentInfo.YearLevel"
+            }
+        },
+
+        # --- Step 4: Lookup subject units ---
+        {
+            "$lookup": {
+                "from": "new_subjects",
+                "localField": "SubjectCode",
+                "foreignField": "_id",
+                "as": "SubjectInfo"
+            }
+        },
+        {"$unwind": "$SubjectInfo"},
+
+        # --- Step 5: Map % grade → 4.0 scale GPA ---
+        {
+            "$addFields": {
+                "GPApoint": gpa_switch_expr()
+            }
+        },
+
+        # --- Step 6: Weighted GPA ---
+        {
+            "$addFields": {
+                "weightedGrade": {"$multiply": ["$GPApoint", "$SubjectInfo.Units"]},
+                "units": "$SubjectInfo.Units"
+            }
+        },
+
+        # --- Step 7: GPA per student per semester ---
+        {
+            "$group": {
+                "_id": {
+                    "StudentID": "$StudentID",
+                    "Name": "$Name",
+                    "Course": "$Course",
+                    "YearLevel": "$YearLevel",
+                    "SemesterID": "$SemesterID"
+                },
+                "totalWeighted": {"$sum": "$weightedGrade"},
+                "totalUnits": {"$sum": "$units"}
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "StudentID": "$_id.StudentID",
+                "Name": "$_id.Name",
+                "Course": "$_id.Course",
+                "YearLevel": "$_id.YearLevel",
+                "SemesterID": "$_id.SemesterID",
+                "GPA": {"$round": [{"$divide": ["$totalWeighted", "$totalUnits"]}, 2]}
+            }
+        },
+
+        # --- Step 8: Collect semester GPAs ---
+        {
+            "$group": {
+                "_id": {
+                    "StudentID": "$StudentID",
+                    "Name": "$Name",
+                    "Course": "$Course",
+                    "YearLevel": "$YearLevel"
+                },
+                "semesters": {
+                    "$push": {
+                        "k": {"$concat": [{"$toString": "$SemesterID"}, "_GPA"]},
+                        "v": "$GPA"
+                    }
+                }
+            }
+        },
+
+        # --- Step 9: Sort semesters ---
+        {
+            "$addFields": {
+                "semesters": {
+                    "$sortArray": {"input": "$semesters", "sortBy": {"k": 1}}
+                }
+            }
+        },
+        {"$addFields": {"semesterMap": {"$arrayToObject": "$semesters"}}},
+
+        # --- Step 10: Trend (compare first vs last GPA) ---
+        {
+            "$addFields": {
+                "sortedGPAs": {
+                    "$map": {
+                        "input": {"$objectToArray": "$semesterMap"},
+                        "as": "sem",
+                        "in": "$$sem.v"
+                    }
+                }
+            }
+        },
+        {
+            "$addFields": {
+                "Overall Trend": {
+                    "$switch": {
+                        "branches": [
+                            {
+                                "case": {"$lt": [
+                                    {"$arrayElemAt": ["$sortedGPAs", 0]},
+                                    {"$arrayElemAt": ["$sortedGPAs", -1]}
+                                ]},
+                                "then": "📈 Improving"
+                            },
+                            {
+                                "case": {"$gt": [
+                                    {"$arrayElemAt": ["$sortedGPAs", 0]},
+                                    {"$arrayElemAt": ["$sortedGPAs", -1]}
+                                ]},
+                                "then": "📉 Declining"
+                            }
+                        ],
+                        "default": "➡ Stable"
+                    }
+                }
+            }
+        },
+
+        # --- Step 11: Flatten output ---
+        {
+            "$replaceRoot": {
+                "newRoot": {
+                    "$mergeObjects": [
+                        {
+                            "StudentID": "$_id.StudentID",
+                            "Name": "$_id.Name",
+                            "Course": "$_id.Course",
+                            "YearLevel": "$_id.YearLevel"
+                        },
+                        "$semesterMap",
+                        {"Overall Trend": "$Overall Trend"}
+                    ]
+                }
+            }
+        },
+
+        # --- Step 12: Sort final results ---
+        {"$sort": {"StudentID": 1}}
+    ]
+    return pipeline
+
+
+def student_progress_pipeline(student_id):
+    pipeline = [
+        # Step 1: Filter by StudentID
+        {"$match": {"StudentID": student_id}},
+
+        # Step 2: Join with students
+        {
+            "$lookup": {
+                "from": "new_students",
+                "localField": "StudentID",
+                "foreignField": "_id",
+                "as": "StudentInfo"
+            }
+        },
+        {"$unwind": "$StudentInfo"},
+
+        # Step 3: Unwind arrays
+        {"$unwind": {"path": "$SubjectCodes", "includeArrayIndex": "idx"}},
+
+        # Step 4: Align Grades
+        {
+            "$project": {
+                "StudentID": 1,
+                "SemesterID": 1,
+                "SubjectCode": "$SubjectCodes",
+                "Grade": {"$arrayElemAt": ["$Grades", "$idx"]},
+                "Name": "$StudentInfo.Name"
+            }
+        },
+
+        # Step 5: Join with subjects
+        {
+            "$lookup": {
+                "from": "new_subjects",
+                "localField": "SubjectCode",
+                "foreignField": "_id",
+                "as": "SubjectInfo"
+            }
+        },
+        {"$unwind": "$SubjectInfo"},
+
+        # Step 6: Join with semesters
+        {
+            "$lookup": {
+                "from": "new_semesters",
+                "localField": "SemesterID",
+                "foreignField": "_id",
+                "as": "SemesterInfo"
+            }
+        },
+        {"$unwind": {"path": "$SemesterInfo", "preserveNullAndEmptyArrays": True}},
+
+        # Step 7: Convert raw % → GPA points
+        {
+            "$addFields": {
+                "GPApoint": gpa_switch_expr(),
+                "Units": "$SubjectInfo.Units",
+                "SubjectDescription": "$SubjectInfo.Description",
+                "Semester": "$SemesterInfo.Semester",
+                "SchoolYear": "$SemesterInfo.SchoolYear"
+            }
+        },
+
+        # Step 8: Weighted grade
+        {
+            "$addFields": {
+                "weightedGrade": {"$multiply": ["$GPApoint", "$Units"]}
+            }
+        },
+
+        # Step 9: Group by Semester
+        {
+            "$group": {
+                "_id": {
+                    "StudentID": "$StudentID",
+                    "SemesterID": "$SemesterID",
+                    "Semester": "$Semester",
+                    "SchoolYear": "$SchoolYear",
+                    "Name": "$Name"
+                },
+                "totalWeighted": {"$sum": "$weightedGrade"},
+                "totalUnits": {"$sum": "$Units"},
+                "subjects": {
+                    "$push": {
+                        "SubjectCode": "$SubjectCode",
+                        "SubjectDescription": "$SubjectDescription",
+                        "Units": "$Units",
+                        "Grade": "$Grade",
+                        "GPApoint": "$GPApoint"
+                    }
+                }
+            }
+        },
+
+        # Step 10: Compute GPA
+        {
+            "$project": {
+                "_id": 0,
+                "StudentID": "$_id.StudentID",
+                "Name": "$_id.Name",
+                "SemesterID": "$_id.SemesterID",
+                "Semester": "$_id.Semester",
+                "SchoolYear": "$_id.SchoolYear",
+                "SemesterGPA": {
+                    "$round": [
+                        {"$divide": ["$totalWeighted", "$totalUnits"]}, 2
+                    ]
+                },
+                "subjects": 1
+            }
+        },
+
+        # Step 11: Expand subjects back to rows
+        {"$unwind": "$subjects"},
+        {
+            "$project": {
+                "StudentID": 1,
+                "Name": 1,
+                "SemesterID": 1,
+                "Semester": 1,
+                "SchoolYear": 1,
+                "SubjectCode": "$subjects.SubjectCode",
+                "SubjectDescription": "$subjects.SubjectDescription",
+                "Units": "$subjects.Units",
+                "Grade": "$subjects.Grade",
+                "SemesterGPA": 1
+            }
+        },
+        {"$sort": {"SemesterID": 1, "SubjectCode": 1}}
+    ]
+    return pipeline
+
+
+def subject_difficulty_pipeline(teacher_name):
+    pipeline = [
+        {"$match": {"Teachers": teacher_name}},  # filter teacher early
+
+        # Zip the parallel arrays into [subject, grade, teacher] rows (truncated
+        # to the shortest array) and keep only this teacher's rows, so a single
+        # $unwind emits one document per relevant enrollment
+        {"$project": {
+            "_id": 0,
+            "StudentID": 1,
+            "rows": {
+                "$filter": {
+                    "input": {"$zip": {"inputs": ["$SubjectCodes", "$Grades", "$Teachers"]}},
+                    "as": "row",
+                    "cond": {"$eq": [{"$arrayElemAt": ["$$row", 2]}, teacher_name]}
+                }
+            }
+        }},
+        {"$unwind": "$rows"},
+
+        # Project clean fields
+        {"$project": {
+            "StudentID": 1,
+            "CourseCode": {"$arrayElemAt": ["$rows", 0]},
+            "Grade": {"$arrayElemAt": ["$rows", 1]},
+            "Teacher": {"$arrayElemAt": ["$rows", 2]}
+        }}
+    ]
+    return pipeline
+
+
+def grade_submission_pipeline(teacher_name):
+    pipeline = [
+        # Step 0: Only grade documents that involve this teacher (uses the Teachers index)
+        {"$match": {"Teachers": teacher_name}},
+
+        # Step 1: Unwind arrays so each subject-grade-teacher aligns
+        {"$unwind": {"path": "$SubjectCodes", "includeArrayIndex": "idx"}},
+
+        # Step 2: Align Grade and Teacher with subject index
+        {
+            "$project": {
+                "StudentID": 1,
+                "SemesterID": 1,
+                "SubjectCode": "$SubjectCodes",
+                "Grade": {"$arrayElemAt": ["$Grades", "$idx"]},
+                "Teacher": {"$arrayElemAt": ["$Teachers", "$idx"]}
+            }
+        },
+
+        # Step 3: Filter only records handled by selected teacher
+        {"$match": {"Teacher": teacher_name}},
+
+        # Step 4: Join with subject descriptions
+        {
+            "$lookup": {
+                "from": "new_subjects",
+                "localField": "SubjectCode",
+                "foreignField": "_id",
+                "as": "SubjectInfo"
+            }
+        },
+        {"$unwind": "$SubjectInfo"},
+
+        # Step 5: Mark whether grade is submitted
+        {
+            "$addFields": {
+                "isSubmitted": {
+                    "$cond": [
+                        {"$or": [{"$eq": ["$Grade", None]}, {"$eq": ["$Grade", ""]}]},
+                        0,
+                        1
+                    ]
+                }
+            }
+        },
+
+        # Step 6: Group by Subject and Semester
+        {
+            "$group": {
+                "_id": {
+                    "SubjectCode": "$SubjectCode",
+                    "SubjectDescription": "$SubjectInfo.Description",
+                    "SemesterID": "$SemesterID"
+                },
+                "SubmittedGrades": {"$sum": "$isSubmitted"},
+                "NoGrades": {"$sum": {"$cond": [{"$eq": ["$isSubmitted", 0]}, 1, 0]}},
+                "TotalStudents": {"$sum": 1}
+            }
+        },
+
+        # Step 7: Compute submission rate
+        {
+            "$addFields": {
+                "SubmissionRate (%)": {
+                    "$round": [
+                        {"$multiply": [{"$divide": ["$SubmittedGrades", "$TotalStudents"]}, 100]},
+                        2
+                    ]
+                }
+            }
+        },
+
+        # Step 8: Flatten fields
+        {
+            "$project": {
+                "_id": 0,
+                "SubjectCode": "$_id.SubjectCode",
+                "SubjectDescription": "$_id.SubjectDescription",
+                "SubmittedGrades": 1,
+                "NoGrades": 1,
+                "TotalStudents": 1,
+                "SubmissionRate (%)": 1,
+                "SemesterID": "$_id.SemesterID"
+            }
+        },
+
+        # Step 9: Sort results
+        {"$sort": {"SemesterID": 1, "SubjectCode": 1}}
+    ]
+    return pipeline
+
+
+def low_grades_pipeline(subject_code, teacher_name, student_id=None, after=None):
+    # Rows keep the grade document's _id and come out in _id order, so a
+    # page continues with after=<last row's _id>
+    match_stage = {
+        "SubjectCodes": subject_code,
+        "Teachers": teacher_name
+    }
+    if student_id is not None:
+        match_stage["StudentID"] = student_id
+    if after is not None:
+        match_stage["_id"] = {"$gt": after}
+
+    pipeline = [
+        {"$match": match_stage},
+        {"$sort": {"_id": 1}},
+        {
+            "$project": {
+                "StudentID": 1,
+                "SubjectIndex": {
+                    "$indexOfArray": ["$SubjectCodes", subject_code]
+                },
+                "Grades": 1,
+                "Teachers": 1,
+                "SemesterID": 1,
+                "SubjectCodes": 1
+            }
+        },
+        {
+            "$project": {
+                "StudentID": 1,
+                "SemesterID": 1,
+                "SubjectCode": {"$arrayElemAt": ["$SubjectCodes", "$SubjectIndex"]},
+                "Teacher": {"$arrayElemAt": ["$Teachers", "$SubjectIndex"]},
+                "Grade": {"$arrayElemAt": ["$Grades", "$SubjectIndex"]}
+            }
+        },
+        {
+            "$lookup": {
+                "from": "new_students",
+                "localField": "StudentID",
+                "foreignField": "_id",
+                "as": "student_info"
+            }
+        },
+        {"$unwind": "$student_info"},
+        {
+            "$lookup": {
+                "from": "new_semesters",
+                "localField": "SemesterID",
+                "foreignField": "_id",
+                "as": "sem_info"
+            }
+        },
+        {"$unwind": "$sem_info"},
+        {
+            "$lookup": {
+                "from": "new_subjects",
+                "localField": "SubjectCode",
+                "foreignField": "_id",
+                "as": "subject_info"
+            }
+        },
+        {"$unwind": "$subject_info"},
+        {
+            "$project": {
+                "_id": 1,
+                "StudentID": 1,
+                "Name": "$student_info.Name",
+                "SubjectCode": "$SubjectCode",
+                "SubjectDescription": "$subject_info.Description",
+                "Teacher": 1,
+                "Semester": "$sem_info.Semester",
+                "SchoolYear": "$sem_info.SchoolYear",
+                "Grade": 1
+            }
+        },
+        {
+            "$match": {
+                "$or": [
+                    {"Grade": {"$lt": 75}}
+                ]
+            }
+        }
+    ]
+    return pipeline
+
+
+def grade_range_expr(grade="$Grade"):
+    # Same intervals as pd.cut(bins=GRADE_BINS, include_lowest=True):
+    # [0, 74], (74, 79], ..., (94, 100]; anything else is "No Grade"
+    branches = [{
+        "case": {"$and": [{"$gte": [grade, GRADE_BINS[0]]}, {"$lte": [grade, GRADE_BINS[1]]}]},
+        "then": GRADE_LABELS[0]
+    }]
+    for low, high, label in zip(GRADE_BINS[1:], GRADE_BINS[2:], GRADE_LABELS[1:]):
+        branches.append({
+            "case": {"$and": [{"$gt": [grade, low]}, {"$lte": [grade, high]}]},
+            "then": label
+        })
+
+    return {
+        "$cond": [
+            {"$isNumber": grade},
+            {"$switch": {"branches": branches, "default": NO_GRADE}},
+            NO_GRADE
+        ]
+    }
+
+
+def distribution_pipeline(teacher_name, semester_id):
+    return [
+        {"$match": {"Teachers": teacher_name, "SemesterID": semester_id}},
+        {"$unwind": {"path": "$SubjectCodes", "includeArrayIndex": "idx"}},
+        {
+            "$project": {
+                "_id": 0,
+                "StudentID": 1,
+                "SubjectCode": "$SubjectCodes",
+                "Teacher": {"$arrayElemAt": ["$Teachers", "$idx"]},
+                "Grade": {"$arrayElemAt": ["$Grades", "$idx"]}
+            }
+        },
+        # keep only the selected teacher; pivot counts non-null StudentIDs
+        {"$match": {"Teacher": teacher_name, "StudentID": {"$ne": None}}},
+        {
+            "$group": {
+                "_id": {"SubjectCode": "$SubjectCode", "GradeRange": grade_range_expr()},
+                "count": {"$sum": 1}
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "SubjectCode": "$_id.SubjectCode",
+                "GradeRange": "$_id.GradeRange",
+                "count": 1
+            }
+        }
+    ]
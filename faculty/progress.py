@@ -0,0 +1,204 @@
+import os
+
+import pandas as pd
+
+from faculty import dimensions, gpa_store, indexes, pipelines, queries, telemetry
+from faculty.enrollments import explode_grades
+from faculty.gpa import gpa_points, semester_gpa
+from faculty.trends import DECLINING, IMPROVING, NO_TREND, STABLE, classify_trends
+
+##############################################
+# Student ID progress tracker
+#
+# Per-subject rows for one student with their unit-weighted semester GPA.
+#   "server"  student_progress_pipeline: three $lookups and the GPA $switch
+#             run inside MongoDB
+#   "client"  fetch the student's grade documents only, join the cached
+#             dimensions and score with gpa_points()/semester_gpa()
+# Both produce the same rows. Select with FACULTY_GPA_MODE.
+##############################################
+
+PROGRESS_COLUMNS = [
+    "StudentID", "Name", "SemesterID", "Semester", "SchoolYear",
+    "SubjectCode", "SubjectDescription", "Units", "Grade", "SemesterGPA"
+]
+
+DEFAULT_MODE = "server"
+
+
+def gpa_mode():
+    return os.getenv("FACULTY_GPA_MODE", DEFAULT_MODE)
+
+
+def progress_from_grades(docs, student, subjects, semesters):
+    # docs: the student's new_grades documents; student: their new_students
+    # document; subjects / semesters: {_id: doc} dimension maps
+    df = explode_grades(docs)
+
+    # the pipeline's inner $lookup drops subjects missing from new_subjects
+    df = df[df["SubjectCode"].isin(subjects.keys())].reset_index(drop=True)
+    if df.empty:
+        return pd.DataFrame(columns=PROGRESS_COLUMNS)
+
+    subject_info = df["SubjectCode"].map(subjects)
+    semester_info = df["SemesterID"].map(semesters)
+
+    df["Name"] = student.get("Name")
+    df["Units"] = subject_info.map(lambda s: s.get("Units"))
+    df["SubjectDescription"] = subject_info.map(lambda s: s.get("Description"))
+    df["Semester"] = semester_info.map(lambda s: s.get("Semester") if isinstance(s, dict) else None)
+    df["SchoolYear"] = semester_info.map(lambda s: s.get("SchoolYear") if isinstance(s, dict) else None)
+
+    df["GPApoint"] = gpa_points(df["Grade"].to_numpy())
+    scored = df.assign(Units=pd.to_numeric(df["Units"], errors="coerce"))
+    gpa = semester_gpa(scored, ["SemesterID"])
+    df["SemesterGPA"] = df["SemesterID"].map(gpa.set_index("SemesterID")["GPA"])
+
+    df = df.sort_values(["SemesterID", "SubjectCode"], kind="stable")
+    return df[PROGRESS_COLUMNS].reset_index(drop=True)
+
+
+def student_progress(db, student_id, mode=None):
+    # Returns the tracker rows for one student (empty when there are none)
+    mode = mode or gpa_mode()
+
+    if mode == "server":
+        results = queries.fetch(db, "tracker.student_progress", student_id)
+        return pd.DataFrame(results, columns=PROGRESS_COLUMNS)
+
+    if mode == "client":
+        # the pipeline's inner $lookup on new_students drops unknown students
+        student = dimensions.student_map(db).get(student_id)
+        if student is None:
+            return pd.DataFrame(columns=PROGRESS_COLUMNS)
+
+        docs = queries.fetch(db, "grades.by_student", student_id)
+        semesters = dimensions.SEMESTERS.by_id(db)
+        subjects = dimensions.SUBJECTS.by_id(db)
+        return progress_from_grades(docs, student, subjects, semesters)
+
+    raise ValueError(f"Unknown GPA mode: {mode}")
+
+
+##############################################
+# YearLevel progress tracker
+#
+# One row per student of the year level with a "<SemesterID>_GPA" column
+# per semester and the first-vs-last Overall Trend. Reads the precomputed
+# student_semester_gpa store once it has been built, and falls back to
+# year_level_progress_pipeline until then.
+##############################################
+
+STUDENT_COLUMNS = ["StudentID", "Name", "Course", "YearLevel"]
+
+# Labels the pipeline has always shown; one semester counts as stable
+YEAR_LEVEL_TRENDS = {
+    NO_TREND: "➡ Stable",
+    IMPROVING: "📈 Improving",
+    DECLINING: "📉 Declining",
+    STABLE: "➡ Stable",
+}
+
+
+def year_level_table(students, gpa_rows):
+    # students: new_students documents of the cohort; gpa_rows: their
+    # student_semester_gpa rows
+    gpa = pd.DataFrame(gpa_rows, columns=["StudentID", "SemesterID", "GPA"])
+    if gpa.empty:
+        return pd.DataFrame(columns=STUDENT_COLUMNS + ["Overall Trend"])
+
+    gpa["Column"] = gpa["SemesterID"].astype(str) + "_GPA"
+    wide = gpa.pivot(index="StudentID", columns="Column", values="GPA")
+
+    # the pipeline sorted each student's semesters by key, as strings
+    semester_cols = sorted(wide.columns)
+    wide = wide[semester_cols]
+    trend = classify_trends(wide.to_numpy(dtype=float))
+    wide["Overall Trend"] = pd.Series(trend, index=wide.index).map(YEAR_LEVEL_TRENDS)
+
+    info = pd.DataFrame(students).rename(columns={"_id": "StudentID"})
+    info = info.reindex(columns=STUDENT_COLUMNS)
+    table = info.merge(wide.reset_index(), on="StudentID", how="inner")
+    return table.sort_values("StudentID", kind="stable").reset_index(drop=True)
+
+
+COHORT_CHUNK_SIZE = 1000
+
+
+def cohort_chunks(student_ids, size=COHORT_CHUNK_SIZE):
+    # Students are independent in both read paths, so a large cohort is
+    # matched in bounded $in lists and the results concatenated
+    for start in range(0, len(student_ids), size):
+        yield student_ids[start:start + size]
+
+
+def year_level_progress(db, year_level):
+    # The cohort comes first, from the YearLevel index on new_students
+    students = queries.fetch(db, "students.by_year_level", year_level)
+    return cohort_table(db, year_level, students)
+
+
+def year_level_page(db, year_level, after=None, limit=None):
+    # One keyset page of the cohort (StudentID order) and the StudentID to
+    # continue after, None on the last page
+    students = queries.fetch(db, "students.by_year_level", year_level, after, limit=limit or 0)
+    last = students[-1]["_id"] if limit and len(students) == limit else None
+    return cohort_table(db, year_level, students), last
+
+
+def year_level_columns(db):
+    # Fixed columns for a paged export: a page only has the semesters its
+    # own students took, so every semester gets a column
+    semester_cols = sorted(f"{s['_id']}_GPA" for s in dimensions.semesters(db))
+    return STUDENT_COLUMNS + semester_cols + ["Overall Trend"]
+
+
+def cohort_table(db, year_level, students):
+    if not students:
+        return pd.DataFrame(columns=STUDENT_COLUMNS + ["Overall Trend"])
+    student_ids = [s["_id"] for s in students]
+
+    # The live pipeline whenever the store is missing or behind new_grades
+    if not gpa_store.store_ready(db):
+        rows = []
+        for chunk in cohort_chunks(student_ids):
+            rows += queries.fetch(db, "tracker.year_level_progress", year_level, chunk)
+        if not rows:
+            return pd.DataFrame(columns=STUDENT_COLUMNS + ["Overall Trend"])
+        return pd.DataFrame(rows).sort_values("StudentID", kind="stable").reset_index(drop=True)
+
+    rows = []
+    for chunk in cohort_chunks(student_ids):
+        rows += queries.fetch(db, "gpa.by_students", chunk)
+    with telemetry.span("year_level.pivot"):
+        return year_level_table(students, rows)
+
+
+def year_level_plan(db, year_level, cohort_first=True):
+    # Documents examined vs returned by the pipeline read path, from
+    # explain(executionStats) alone, so each pipeline runs once;
+    # cohort_first=False measures the old plan that joins every grade
+    # document before filtering
+    if cohort_first:
+        student_ids = [s["_id"] for s in queries.fetch(db, "students.by_year_level", year_level)]
+        chunks = list(cohort_chunks(student_ids))
+    else:
+        student_ids, chunks = None, [None]
+
+    keys_examined = docs_examined = returned = 0
+    for chunk in chunks:
+        pipeline = pipelines.year_level_progress_pipeline(year_level, chunk)
+        explain = db.command("explain", {"aggregate": "new_grades", "pipeline": pipeline, "cursor": {}},
+                             verbosity="executionStats")
+        keys, docs = indexes.examined_counts(explain)
+        keys_examined += keys
+        docs_examined += docs
+        returned += indexes.returned_count(explain)
+
+    return {
+        "cohort": None if student_ids is None else len(student_ids),
+        "chunks": len(chunks),
+        "keys_examined": keys_examined,
+        "docs_examined": docs_examined,
+        "returned": returned,
+    }
@@ -0,0 +1,293 @@
+import os
+import time
+
+import bson
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+from faculty import pipelines, teachers, telemetry
+
+##############################################
+# Named queries
+#
+# Every read the tabs issue is declared here once: its collection, the
+# exact fields it needs and a builder that turns the call arguments into a
+# filter or pipeline. fetch() runs it with a per-query cursor batch size
+# and records documents, bytes received and time per query name
+# (query_stats(); FACULTY_QUERY_LOG=1 also prints one line per call). The
+# MongoDB commands a call issues are tagged with its name (faculty.telemetry).
+#
+# Builders take (db, *args) and return a spec dict:
+#   find              {"filter": ..., "sort": ..., "limit": ..., "collation": ...}
+#   aggregate         {"pipeline": ..., "collation": ...}
+#   distinct          {"key": ..., "filter": ..., "collation": ...}
+#
+# Queries that take an `after` argument are keyset-paged on _id: they
+# sort by it and only return documents past `after`, so
+# fetch(..., after, limit=n) reads one page (see faculty.paging).
+#
+# `sample` names the faculty.indexes.sample_params() entries used as the
+# builder arguments when the index verifier explains the query.
+##############################################
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Bytes are measured on the raw BSON replies before decoding
+_RAW = CodecOptions(document_class=RawBSONDocument)
+
+# Fields the grade explode needs from new_grades
+GRADE_ARRAYS = {"_id": 0, "StudentID": 1, "SemesterID": 1, "SubjectCodes": 1, "Grades": 1, "Teachers": 1}
+
+QUERIES = {}
+_stats = {}
+
+
+def named_query(name, collection, kind="find", projection=None, batch_size=None,
+                sample=(), allow_collscan=None):
+    def decorator(build):
+        QUERIES[name] = {
+            "name": name,
+            "collection": collection,
+            "kind": kind,
+            "projection": projection,
+            "batch_size": batch_size or DEFAULT_BATCH_SIZE,
+            "build": build,
+            "sample": sample,
+            "allow_collscan": allow_collscan,
+        }
+        return build
+    return decorator
+
+
+def build_spec(db, name, *args):
+    return QUERIES[name]["build"](db, *args)
+
+
+def fetch(db, name, *args, batch_size=None, limit=None):
+    query = QUERIES[name]
+    spec = query["build"](db, *args)
+    coll = db.get_collection(query["collection"], codec_options=_RAW)
+    batch_size = batch_size or query["batch_size"]
+    limit = limit if limit is not None else spec.get("limit", 0)
+    options = {"collation": spec["collation"]} if spec.get("collation") else {}
+
+    started = time.perf_counter()
+    nbytes = 0
+
+    with telemetry.query_scope(name):
+        if query["kind"] == "distinct":
+            cmd = {"distinct": query["collection"], "key": spec["key"], "query": spec.get("filter", {})}
+            cmd.update({k: v.document for k, v in options.items()})
+            reply = db.command(cmd, codec_options=_RAW)
+            nbytes = len(reply.raw)
+            result = bson.decode(reply.raw)["values"]
+            count = len(result)
+        else:
+            if query["kind"] == "aggregate":
+                pipeline = spec["pipeline"] + ([{"$limit": limit}] if limit else [])
+                cursor = coll.aggregate(pipeline, batchSize=batch_size, **options)
+            else:
+                cursor = coll.find(spec.get("filter", {}), query["projection"],
+                                   sort=spec.get("sort"), batch_size=batch_size, limit=limit, **options)
+            result = []
+            for raw in cursor:
+                nbytes += len(raw.raw)
+                result.append(bson.decode(raw.raw))
+            count = len(result)
+
+    _record(name, count, nbytes, time.perf_counter() - started)
+    return result
+
+
+def count(db, name, *args):
+    # Documents matching a find query, or an aggregate's leading $match (an
+    # upper bound on its rows); index-only where the filter is indexed
+    query = QUERIES[name]
+    spec = query["build"](db, *args)
+    if query["kind"] == "aggregate":
+        first = spec["pipeline"][0] if spec["pipeline"] else {}
+        query_filter = first.get("$match", {})
+    else:
+        query_filter = spec.get("filter", {})
+    options = {"collation": spec["collation"]} if spec.get("collation") else {}
+
+    started = time.perf_counter()
+    with telemetry.query_scope(name + ":count"):
+        total = db[query["collection"]].count_documents(query_filter, **options)
+    _record(name + ":count", 0, 0, time.perf_counter() - started)
+    return total
+
+
+def _record(name, count, nbytes, seconds):
+    stats = _stats.setdefault(name, {"calls": 0, "docs": 0, "bytes": 0, "seconds": 0.0})
+    stats["calls"] += 1
+    stats["docs"] += count
+    stats["bytes"] += nbytes
+    stats["seconds"] += seconds
+    if os.getenv("FACULTY_QUERY_LOG") == "1":
+        print(f"[query] {name}: {count} doc(s), {nbytes:,} bytes, {seconds * 1000:.1f} ms")
+
+
+def query_stats():
+    return {name: dict(stats) for name, stats in _stats.items()}
+
+
+def _teacher_collation(db):
+    # Grade lookups run under the case-insensitive collation while new_grades
+    # has documents the teacher keys do not cover yet
+    return {} if teachers.KEY_STORES["new_grades"].ready(db) else {"collation": teachers.TEACHER_COLLATION}
+
+
+##############################################
+# Login / Home
+##############################################
+
+@named_query("grades.teachers", "new_grades", kind="distinct")
+def _grades_teachers(db):
+    return {"key": "Teachers"}
+
+
+@named_query("catalog.teachers", "teacher_catalog", projection={"_id": 1})
+def _catalog_teachers(db):
+    return {"sort": [("_id", 1)]}
+
+
+@named_query("catalog.by_teacher", "teacher_catalog", projection={"_id": 0, "Subjects": 1}, sample=("teacher",))
+def _catalog_by_teacher(db, teacher_name):
+    return {"filter": {"_id": teacher_name}}
+
+
+@named_query("subjects.by_teacher", "new_subjects",
+             projection={"_id": 1, "Description": 1, "Units": 1, "Teacher": 1},
+             sample=("teacher",))
+def _subjects_by_teacher(db, teacher_name):
+    query, options = teachers.subjects_query(db, teacher_name)
+    return {"filter": query, **options}
+
+
+@named_query("subjects.descriptions_by_teacher", "new_subjects", kind="distinct", sample=("teacher",))
+def _subject_descriptions_by_teacher(db, teacher_name):
+    query, options = teachers.subjects_query(db, teacher_name)
+    return {"key": "Description", "filter": query, **options}
+
+
+##############################################
+# Class Grade Distribution / Intervention
+##############################################
+
+@named_query("distribution.buckets", "new_grades", kind="aggregate", sample=("teacher", "semester_id"))
+def _distribution_buckets(db, teacher_name, semester_id):
+    return {"pipeline": pipelines.distribution_pipeline(teacher_name, semester_id)}
+
+
+@named_query("grades.by_teacher_semester", "new_grades", projection=GRADE_ARRAYS,
+             sample=("teacher", "semester_id"))
+def _grades_by_teacher_semester(db, teacher_name, semester_id):
+    return {"filter": {"Teachers": teacher_name, "SemesterID": semester_id}}
+
+
+@named_query("grades.by_teacher", "new_grades", projection={**GRADE_ARRAYS, "_id": 1}, sample=("teacher",))
+def _grades_by_teacher(db, teacher_name, after=None):
+    query = {"Teachers": teacher_name}
+    if after is not None:
+        query["_id"] = {"$gt": after}
+    return {"filter": query, "sort": [("_id", 1)]}
+
+
+@named_query("grades.by_semester", "new_grades", projection=GRADE_ARRAYS, batch_size=5000,
+             sample=("semester_id",))
+def _grades_by_semester(db, semester_id):
+    return {"filter": {"SemesterID": semester_id}}
+
+
+##############################################
+# Student Progress Tracker
+##############################################
+
+@named_query("students.year_levels", "new_students", kind="distinct")
+def _students_year_levels(db):
+    return {"key": "YearLevel"}
+
+
+@named_query("students.courses", "new_students", kind="distinct")
+def _students_courses(db):
+    return {"key": "Course"}
+
+
+@named_query("students.by_year_level", "new_students",
+             projection={"_id": 1, "Name": 1, "Course": 1, "YearLevel": 1}, sample=("year_level",))
+def _students_by_year_level(db, year_level, after=None):
+    query = {"YearLevel": year_level}
+    if after is not None:
+        query["_id"] = {"$gt": after}
+    return {"filter": query, "sort": [("_id", 1)]}
+
+
+@named_query("gpa.by_students", "student_semester_gpa",
+             projection={"_id": 0, "StudentID": 1, "SemesterID": 1, "GPA": 1}, sample=("student_ids",))
+def _gpa_by_students(db, student_ids):
+    return {"filter": {"StudentID": {"$in": list(student_ids)}}}
+
+
+@named_query("tracker.year_level_progress", "new_grades", kind="aggregate",
+             sample=("year_level", "student_ids"))
+def _tracker_year_level_progress(db, year_level, student_ids):
+    return {"pipeline": pipelines.year_level_progress_pipeline(year_level, student_ids)}
+
+
+@named_query("tracker.student_progress", "new_grades", kind="aggregate", sample=("student_id",))
+def _tracker_student_progress(db, student_id):
+    return {"pipeline": pipelines.student_progress_pipeline(student_id)}
+
+
+@named_query("grades.by_student", "new_grades", projection=GRADE_ARRAYS, sample=("student_id",))
+def _grades_by_student(db, student_id):
+    return {"filter": {"StudentID": student_id}}
+
+
+@named_query("grades.by_subject", "new_grades", projection=GRADE_ARRAYS, sample=("subject_code",))
+def _grades_by_subject(db, subject_code):
+    return {"filter": {"SubjectCodes": subject_code}, "limit": 500}
+
+
+@named_query("grades.by_students", "new_grades", projection=GRADE_ARRAYS, sample=("student_ids",))
+def _grades_by_students(db, student_ids):
+    return {"filter": {"StudentID": {"$in": list(student_ids)}}}
+
+
+##############################################
+# Heatmap / Submission / Custom Query / Analytics
+##############################################
+
+@named_query("heatmap.rows", "new_grades", kind="aggregate", sample=("teacher",))
+def _heatmap_rows(db, teacher_name):
+    return {"pipeline": pipelines.subject_difficulty_pipeline(teacher_name)}
+
+
+@named_query("submission.status", "new_grades", kind="aggregate", sample=("teacher",))
+def _submission_status(db, teacher_name):
+    return {"pipeline": pipelines.grade_submission_pipeline(teacher_name)}
+
+
+@named_query("roster.student_ids", "new_grades", kind="distinct", sample=("teacher",))
+def _roster_student_ids(db, teacher_name):
+    return {"key": "StudentID", "filter": {"Teachers": teacher_name}}
+
+
+@named_query("custom.low_grades", "new_grades", kind="aggregate",
+             sample=("subject_code", "teacher", "student_id"))
+def _custom_low_grades(db, subject_code, teacher_name, student_id=None, after=None):
+    return {"pipeline": pipelines.low_grades_pipeline(subject_code, teacher_name, student_id, after)}
+
+
+@named_query("analytics.teacher_subjects", "new_grades", kind="aggregate", sample=("teacher",))
+def _analytics_teacher_subjects(db, teacher_name):
+    options = _teacher_collation(db)
+    pipeline = pipelines.teacher_subjects_with_semester_pipeline(teacher_name, by_key=not options)
+    return {"pipeline": pipeline, **options}
+
+
+@named_query("analytics.student_grades", "new_grades", kind="aggregate",
+             sample=("subject_code", "teacher", "semester_id"))
+def _analytics_student_grades(db, subject_code, teacher_name, semester_id):
+    return {"pipeline": pipelines.student_grades_by_subject_teacher_pipeline(subject_code, teacher_name, semester_id)}
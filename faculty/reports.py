@@ -0,0 +1,294 @@
+import argparse
+import hashlib
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from faculty import dimensions, queries
+from faculty.artifacts import ARTIFACTS, frame_digest
+from faculty.db import get_database
+from faculty.distribution import pivot_from_enrollments
+from faculty.enrollments import explode_grades
+from faculty.pdf import df_to_pdf, generate_pdf_heatmap, generate_pdf_intervention, generate_pdf_submission
+
+##############################################
+# Report tables
+#
+# The DataFrame transforms behind the report tabs, shared by app.py and
+# the batch CLI below.
+##############################################
+
+SUBMISSION_COLUMNS = [
+    "SemesterID",
+    "SubjectCode",
+    "SubjectDescription",
+    "SubmittedGrades",
+    "NoGrades",
+    "TotalStudents",
+    "SubmissionRate (%)"
+]
+
+
+def classify_difficulty(rate):
+    if rate >= 40:
+        return "Very Hard"
+    elif rate >= 25:
+        return "Hard"
+    elif rate >= 10:
+        return "Moderate"
+    else:
+        return "Easy"
+
+
+def heatmap_summary(df, subj_map):
+    # df: StudentID, CourseCode, Grade rows of one teacher
+    df = df.copy()
+
+    # -------------------------------
+    # Map course descriptions
+    # -------------------------------
+    df["CourseDescription"] = df["CourseCode"].map(subj_map)
+
+    # -------------------------------
+    # Fail / Dropout Calculation
+    # -------------------------------
+    df["Success"] = df["Grade"].apply(lambda x: 1 if (x is not None and x >= 75) else 0)
+    df["Fail"] = df["Grade"].apply(lambda x: 1 if (x is not None and x < 75) else 0)
+    df["Dropout"] = df["Success"] - df["Fail"]
+
+    summary = df.groupby(["CourseCode", "CourseDescription"]).agg(
+        total=("StudentID", "count"),
+        success=("Success", "sum"),
+        fail=("Fail", "sum"),
+        dropout=("Dropout", "sum")
+    ).reset_index()
+
+    summary["Success Rate (%)"] = (summary["success"] / summary["total"] * 100).round(2)
+    summary["Fail Rate (%)"] = (summary["fail"] / summary["total"] * 100).round(2)
+    summary["Dropout Rate (%)"] = (summary["dropout"] / summary["total"] * 100).round(2)
+
+    # -------------------------------
+    # Difficulty Level classification
+    # -------------------------------
+    summary["Difficulty Level"] = summary["Fail Rate (%)"].apply(classify_difficulty)
+
+    # -------------------------------
+    # Final Table
+    # -------------------------------
+    return summary[[
+        "CourseCode", "CourseDescription", "Success Rate (%)",  "Fail Rate (%)", "Dropout Rate (%)", "Difficulty Level"
+    ]]
+
+
+def risk_flag(grade):
+    if pd.isna(grade) or grade == "":
+        return "Missing Grade"
+    elif grade < 75:
+        return "At Risk (<75)"
+    else:
+        return "Safe"
+
+
+def intervention_candidates(df, student_names, subj_map):
+    # df: explode_grades() rows of one teacher; returns the non-Safe rows
+    df = df.rename(columns={"Grade": "CurrentGrade", "SemesterID": "Semester"})
+
+    # -------------------------------
+    # Map student names
+    # -------------------------------
+    df["StudentName"] = df["StudentID"].map(student_names)
+
+    # Map subject descriptions
+    df["SubjectDescription"] = df["SubjectCode"].map(subj_map)
+
+    # -------------------------------
+    # Risk Flag
+    # -------------------------------
+    df["RiskFlag"] = df["CurrentGrade"].apply(risk_flag)
+
+    # -------------------------------
+    # Final table
+    # -------------------------------
+    result = df[[
+        "StudentID", "StudentName", "SubjectCode", "SubjectDescription", "Semester", "CurrentGrade", "RiskFlag"
+    ]]
+    return result[result["RiskFlag"] != "Safe"]
+
+
+def intervention_page(db, teacher_name, student_names, subj_map, after=None, limit=None):
+    # Candidates from a keyset page of the teacher's grade documents and the
+    # _id to continue after; pages without a candidate are read through
+    while True:
+        docs = queries.fetch(db, "grades.by_teacher", teacher_name, after, limit=limit or 0)
+        after = docs[-1]["_id"] if limit and len(docs) == limit else None
+        rows = intervention_candidates(explode_grades(docs, teacher=teacher_name), student_names, subj_map)
+        if len(rows) or after is None:
+            return rows.reset_index(drop=True), after
+
+
+def intervention_pdf(pager, teacher_name, progress=None):
+    # exports builder over a KeysetPager of intervention_page(); the rows
+    # are read afresh, the render is reused while they are unchanged
+    df = pager.read_all()
+    key = ("intervention.pdf", frame_digest(df), teacher_name)
+    return ARTIFACTS.get_or_build(
+        key, lambda: generate_pdf_intervention(df, teacher_name, progress=progress).getvalue())
+
+
+def submission_from_enrollments(df, subj_map):
+    # grade_submission_pipeline, for explode_grades() rows of one teacher:
+    # subjects missing from new_subjects are dropped like its inner $lookup
+    df = df[df["SubjectCode"].isin(subj_map.keys())].copy()
+    df["SubjectDescription"] = df["SubjectCode"].map(subj_map)
+    df["isSubmitted"] = df["Grade"].notna().astype(int)
+
+    summary = df.groupby(["SubjectCode", "SubjectDescription", "SemesterID"], dropna=False).agg(
+        SubmittedGrades=("isSubmitted", "sum"),
+        TotalStudents=("isSubmitted", "size"),
+    ).reset_index()
+    summary["NoGrades"] = summary["TotalStudents"] - summary["SubmittedGrades"]
+    summary["SubmissionRate (%)"] = (summary["SubmittedGrades"] / summary["TotalStudents"] * 100).round(2)
+
+    summary = summary.sort_values(["SemesterID", "SubjectCode"], kind="stable").reset_index(drop=True)
+    return summary[SUBMISSION_COLUMNS]
+
+
+##############################################
+# Batch generation
+#
+#   python -m faculty.reports --semester 12 --all-teachers [--zip]
+#   python -m faculty.reports --semester 12 --teacher "Name" --teacher ...
+#
+# The semester's grade documents are read in one indexed query and
+# exploded once; each teacher's slice is then rendered in a process pool
+# (reportlab is CPU-bound and holds the GIL). Workers never touch the
+# database. Every run writes one directory (or zip) of
+#   <teacher>_<hash>/grade_distribution.pdf, performance_summary.pdf,
+#   intervention_candidates.pdf, grade_submission.pdf
+# with all four reports scoped to the selected semester.
+##############################################
+
+def _slug(name):
+    return re.sub(r"[^A-Za-z0-9]+", "_", str(name)).strip("_") or "teacher"
+
+
+def _teacher_folder(name):
+    # Names that slug alike ("Ann Lee", "Ann-Lee", "ann lee" on a
+    # case-insensitive file system) get distinct folders from a short hash
+    # of the raw name
+    digest = hashlib.blake2b(str(name).encode("utf-8"), digest_size=4).hexdigest()
+    return f"{_slug(name)}_{digest}"
+
+
+def load_semester(db, semester_id):
+    # ({teacher: enrollment rows}, subject descriptions, student names)
+    data = queries.fetch(db, "grades.by_semester", semester_id)
+    df = explode_grades(data)
+    df = df[df["Teacher"].notna()]
+    by_teacher = {teacher: rows.reset_index(drop=True) for teacher, rows in df.groupby("Teacher", sort=True)}
+    return by_teacher, dimensions.subject_descriptions(db), dimensions.student_names(db)
+
+
+def render_teacher(teacher, semester_id, df, subj_map, student_names, out_dir):
+    # Runs in a worker process
+    folder = os.path.join(out_dir, _teacher_folder(teacher))
+    os.makedirs(folder, exist_ok=True)
+    written = []
+
+    def write(name, buffer):
+        path = os.path.join(folder, name)
+        with open(path, "wb") as f:
+            f.write(buffer.getvalue())
+        written.append(path)
+
+    pivot = pivot_from_enrollments(df, subj_map)
+    if not pivot.empty:
+        subtitle = f"Teacher: {teacher} | Semester: {semester_id}"
+        write("grade_distribution.pdf", df_to_pdf(pivot, title="Grade Distribution per Subject", subtitle=subtitle))
+
+    heatmap = heatmap_summary(df.rename(columns={"SubjectCode": "CourseCode"}), subj_map)
+    write("performance_summary.pdf", generate_pdf_heatmap(heatmap, teacher))
+
+    write("intervention_candidates.pdf",
+          generate_pdf_intervention(intervention_candidates(df, student_names, subj_map), teacher))
+
+    write("grade_submission.pdf", generate_pdf_submission(submission_from_enrollments(df, subj_map), teacher))
+    return teacher, written
+
+
+def generate_reports(db, semester_id, teachers=None, out_dir="reports", workers=None, as_zip=False):
+    started = time.perf_counter()
+    by_teacher, subj_map, student_names = load_semester(db, semester_id)
+    if teachers is not None:
+        missing = [t for t in teachers if t not in by_teacher]
+        for teacher in missing:
+            print(f"⚠️ No grades for {teacher} in semester {semester_id}")
+        by_teacher = {t: by_teacher[t] for t in teachers if t in by_teacher}
+    loaded = time.perf_counter() - started
+    if not by_teacher:
+        return {"output": None, "teachers": 0, "files": 0, "load_seconds": loaded, "seconds": loaded}
+
+    run_dir = os.path.join(out_dir, f"semester_{_slug(semester_id)}_{datetime.now():%Y%m%d_%H%M%S}")
+    os.makedirs(run_dir)
+
+    files = 0
+    # spawn: the parent holds pymongo's monitor threads, which fork would copy
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(render_teacher, teacher, semester_id, df, subj_map,
+                        {sid: student_names.get(sid) for sid in df["StudentID"].unique()}, run_dir)
+            for teacher, df in by_teacher.items()
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            teacher, written = future.result()
+            files += len(written)
+            print(f"[{done}/{len(futures)}] {teacher}: {len(written)} file(s)")
+
+    output = run_dir
+    if as_zip:
+        output = shutil.make_archive(run_dir, "zip", run_dir)
+        shutil.rmtree(run_dir)
+
+    return {
+        "output": output,
+        "teachers": len(by_teacher),
+        "files": files,
+        "load_seconds": loaded,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the Faculty Module PDF reports for a semester.")
+    parser.add_argument("--uri", help="MongoDB URI (defaults to MONGODB_URI)")
+    parser.add_argument("--semester", type=int, required=True, help="SemesterID to report on")
+    who = parser.add_mutually_exclusive_group(required=True)
+    who.add_argument("--all-teachers", action="store_true", help="every teacher with grades that semester")
+    who.add_argument("--teacher", action="append", help="a teacher to report on (repeatable)")
+    parser.add_argument("--out", default="reports", help="parent directory for the run (default: reports)")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: CPU count)")
+    parser.add_argument("--zip", action="store_true", help="write one zip per run instead of a directory")
+    args = parser.parse_args(argv)
+
+    db = get_database(args.uri)
+    result = generate_reports(db, args.semester, teachers=args.teacher, out_dir=args.out,
+                              workers=args.workers, as_zip=args.zip)
+    if not result["teachers"]:
+        print(f"❌ No grade records for semester {args.semester}")
+        return 1
+
+    print(f"✅ {result['files']} file(s) for {result['teachers']} teacher(s) in {result['seconds']:.1f} s "
+          f"(data {result['load_seconds']:.1f} s) -> {result['output']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
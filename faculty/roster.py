@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+
+import streamlit as st
+
+from faculty import dimensions, queries
+from faculty.teachers import teacher_key
+
+##############################################
+# Teacher roster search
+#
+# The student pickers offer only the teacher's own enrolled students:
+#   - the roster is the distinct StudentIDs of the teacher's grade
+#     documents (Teachers index), joined with the student name dimension
+#   - it is kept per teacher for ROSTER_TTL_S, with sorted keys on
+#     StudentID digits and on every word of the name
+# so a lookup is two bisect range scans for the typed prefix, returning at
+# most FACULTY_STUDENT_SUGGESTIONS matches. The page only carries those
+# suggestions, however large the student body is.
+##############################################
+
+ROSTER_TTL_S = 300
+SUGGESTIONS = int(os.getenv("FACULTY_STUDENT_SUGGESTIONS", "10"))
+
+_lock = threading.Lock()
+_rosters = {}
+
+
+def _build(db, teacher_name):
+    names = dimensions.student_names(db)
+    student_ids = sorted(queries.fetch(db, "roster.student_ids", teacher_name), key=str)
+
+    by_id = [(str(sid), sid) for sid in student_ids]
+    by_name = sorted(
+        (word, sid)
+        for sid in student_ids
+        for word in set(teacher_key(names.get(sid) or "").replace(",", " ").split())
+    )
+    return {
+        "ids": by_id,
+        "id_keys": [k for k, _ in by_id],
+        "names": by_name,
+        "name_keys": [k for k, _ in by_name],
+        "labels": {sid: names.get(sid) or "" for sid in student_ids},
+    }
+
+
+def teacher_roster(db, teacher_name):
+    key = (db.name, teacher_name)
+    now = time.monotonic()
+    with _lock:
+        cached = _rosters.get(key)
+        if cached and now - cached[0] < ROSTER_TTL_S:
+            return cached[1]
+
+    roster = _build(db, teacher_name)
+    with _lock:
+        _rosters[key] = (now, roster)
+    return roster
+
+
+def _prefixed(keys, entries, prefix, limit):
+    start = bisect_left(keys, prefix)
+    found = []
+    for k, sid in entries[start:start + limit]:
+        if not k.startswith(prefix):
+            break
+        found.append(sid)
+    return found
+
+
+def search(db, teacher_name, text, limit=SUGGESTIONS):
+    # [(StudentID, Name)] whose ID starts with the digits typed, or one of
+    # whose name words starts with each typed word; ID matches first
+    text = teacher_key(text) or ""
+    if not text:
+        return []
+    roster = teacher_roster(db, teacher_name)
+
+    matches = []
+    if text.isdigit():
+        matches = _prefixed(roster["id_keys"], roster["ids"], text, limit)
+
+    words = text.replace(",", " ").split()
+    candidates = _prefixed(roster["name_keys"], roster["names"], words[0], len(roster["names"]))
+    for sid in dict.fromkeys(candidates):
+        if len(matches) >= limit:
+            break
+        name_words = teacher_key(roster["labels"][sid]).replace(",", " ").split()
+        if sid not in matches and all(any(w.startswith(p) for w in name_words) for p in words[1:]):
+            matches.append(sid)
+
+    return [(sid, roster["labels"][sid]) for sid in matches[:limit]]
+
+
+def student_picker(db, teacher_name, key, label="Search student (ID or name)"):
+    # Search box plus a short list of matches; returns the chosen StudentID
+    # or None while nothing is picked
+    text = st.text_input(label, key=key + "-search", placeholder="Type a Student ID or name")
+    if not text.strip():
+        return None
+
+    matches = search(db, teacher_name, text)
+    if not matches:
+        st.caption("No matching students in your classes.")
+        return None
+
+    labels = [f"{sid} — {name}" if name else str(sid) for sid, name in matches]
+    choice = st.selectbox("Student", range(len(matches)), format_func=labels.__getitem__, key=key + "-choice")
+    return matches[choice][0]
@@ -0,0 +1,135 @@
+import argparse
+import sys
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+from pymongo.collation import Collation, CollationStrength
+
+from faculty.db import get_database
+from faculty.freshness import DerivedStore
+
+##############################################
+# Normalized teacher key
+#
+# Teacher names are matched on a canonical key instead of a case-insensitive
+# $regex, so lookups are exact equality on an index:
+#   new_subjects.TeacherKey   <- Teacher
+#   new_grades.TeacherKeys    <- Teachers (same order, same length)
+# The documents are written outside this app, and the dashboard only reads
+# them; the keys are maintained by the CLI below (schedule it, or run it
+# after loading grades), per collection through faculty.freshness:
+#   refresh_keys()            keys for newly inserted documents, or a full
+#                             pass when documents went away or the last
+#                             full pass is FACULTY_KEYS_REBUILD_S old
+#                             (default 3600)
+#   backfill_teacher_keys()   the full pass: every key that is missing or
+#                             no longer matches its name
+# While a collection has documents the last pass has not seen, its
+# KEY_STORES entry is not ready() and queries on it fall back to equality
+# under TEACHER_COLLATION, which has its own case-insensitive index, so new
+# subjects and grades are never dropped. The fallback also tries the name
+# with its whitespace stripped and collapsed (collated_names()), as
+# teacher_key() does, so a name padded with spaces matches in both modes.
+##############################################
+
+TEACHER_COLLATION = Collation(locale="en", strength=CollationStrength.SECONDARY)
+
+KEYS_REBUILD_S = 3600
+
+
+def teacher_key(name):
+    if name is None:
+        return None
+    return " ".join(str(name).split()).casefold()
+
+
+def collated_names(name):
+    # The spellings the TEACHER_COLLATION fallback matches with $in: the
+    # name as given and with teacher_key()'s whitespace normalization
+    if name is None:
+        return [None]
+    return list(dict.fromkeys([name, " ".join(str(name).split())]))
+
+
+_KEY_FIELDS = {
+    "new_subjects": ("Teacher", "TeacherKey", False),
+    "new_grades": ("Teachers", "TeacherKeys", True),
+}
+
+KEY_STORES = {
+    coll_name: DerivedStore(f"teacher_keys.{coll_name}", env="KEYS", label=f"{coll_name} teacher keys",
+                            source=coll_name, rebuild_s=KEYS_REBUILD_S)
+    for coll_name in _KEY_FIELDS
+}
+
+
+def _fill_keys(db, coll_name, query, batch_size):
+    # Sets the key of every matching document whose key is missing or stale
+    source, target, many = _KEY_FIELDS[coll_name]
+    coll = db[coll_name]
+    count = 0
+    ops = []
+    for doc in coll.find(query, {source: 1, target: 1}):
+        value = doc.get(source)
+        key = [teacher_key(t) for t in value or []] if many else teacher_key(value)
+        if target in doc and doc[target] == key:
+            continue
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {target: key}}))
+        if len(ops) >= batch_size:
+            count += coll.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        count += coll.bulk_write(ops, ordered=False).modified_count
+    return count
+
+
+def backfill_teacher_keys(db, batch_size=1000):
+    updated = {}
+    for coll_name, store in KEY_STORES.items():
+        token, started = store.token(db), datetime.now(timezone.utc)
+        updated[coll_name] = _fill_keys(db, coll_name, {}, batch_size)
+        store.record(db, token, rebuilt_at=started)
+    return updated
+
+
+def refresh_keys(db, coll_name, batch_size=1000):
+    store = KEY_STORES[coll_name]
+    action, token, inserted = store.plan(db)
+    if action is None:
+        return 0
+    started = datetime.now(timezone.utc)
+    count = _fill_keys(db, coll_name, inserted if action == "insert" else {}, batch_size)
+    store.record(db, token, rebuilt_at=started if action == "rebuild" else None)
+    return count
+
+
+def subjects_query(db, teacher_name):
+    # (filter, find options) for the subjects taught by teacher_name
+    if KEY_STORES["new_subjects"].ready(db):
+        return {"TeacherKey": teacher_key(teacher_name)}, {}
+    return {"Teacher": {"$in": collated_names(teacher_name)}}, {"collation": TEACHER_COLLATION}
+
+
+##############################################
+# CLI: python -m faculty.teachers [--full]
+##############################################
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain normalized teacher keys.")
+    parser.add_argument("--uri", help="MongoDB URI (defaults to MONGODB_URI)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--full", action="store_true", help="check every document, not only new ones")
+    args = parser.parse_args(argv)
+
+    db = get_database(args.uri)
+    if args.full:
+        updated = backfill_teacher_keys(db, batch_size=args.batch_size)
+    else:
+        updated = {coll_name: refresh_keys(db, coll_name, batch_size=args.batch_size) for coll_name in KEY_STORES}
+    for coll_name, count in updated.items():
+        print(f"✅ {coll_name}: {count} document(s) updated")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
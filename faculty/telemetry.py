@@ -0,0 +1,356 @@
+import contextvars
+import os
+import sys
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import bson
+from pymongo import monitoring
+
+##############################################
+# Command-level instrumentation
+#
+# With FACULTY_COMMAND_METRICS=1 every MongoClient from faculty.db gets a
+# pymongo CommandListener that records each command with its duration,
+# reply size and collection, tagged with:
+#   rerun    begin_rerun() at the top of app.py
+#   tab      set_tab() once the tab is known
+#   query    the named query (queries.fetch / count)
+#   caller   the first faculty / app function on the issuing stack
+# The tags are contextvars, so reads issued through parallel.gather keep
+# the tab and rerun of the script that asked for them (the caller is only
+# found on the script thread). span() records client-side work such as a
+# pandas pivot or a PDF render next to the commands.
+#
+# The records feed
+#   debug_sidebar()   an opt-in per-rerun waterfall in the sidebar
+#   metrics_text()    Prometheus text format counters and histograms, served
+#                     on 127.0.0.1:FACULTY_METRICS_PORT/metrics and/or
+#                     written to FACULTY_METRICS_FILE every
+#                     FACULTY_METRICS_INTERVAL_S (default 15)
+# Without FACULTY_COMMAND_METRICS=1 no listener is registered and the tags
+# and spans cost a contextvar set each.
+##############################################
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+MAX_RERUNS = 20
+MAX_EVENTS_PER_RERUN = 2000
+
+_rerun = contextvars.ContextVar("faculty_rerun", default=None)
+_tab = contextvars.ContextVar("faculty_tab", default=None)
+_query = contextvars.ContextVar("faculty_query", default=None)
+
+_lock = threading.Lock()
+_reruns = OrderedDict()
+_commands = defaultdict(lambda: {"count": 0, "failures": 0, "bytes": 0, "buckets": [0] * len(DURATION_BUCKETS),
+                                 "sum": 0.0})
+_spans = defaultdict(lambda: {"count": 0, "buckets": [0] * len(DURATION_BUCKETS), "sum": 0.0})
+
+
+def enabled():
+    return os.getenv("FACULTY_COMMAND_METRICS") == "1"
+
+
+##############################################
+# Tags
+##############################################
+
+def begin_rerun():
+    # New waterfall for this script run; the previous tab no longer applies
+    rerun_id = uuid.uuid4().hex
+    _rerun.set(rerun_id)
+    _tab.set(None)
+    if enabled():
+        with _lock:
+            _reruns[rerun_id] = {"started": time.perf_counter(), "events": []}
+            while len(_reruns) > MAX_RERUNS:
+                _reruns.popitem(last=False)
+    return rerun_id
+
+
+def set_tab(name):
+    _tab.set(name)
+
+
+@contextmanager
+def query_scope(name):
+    token = _query.set(name)
+    try:
+        yield
+    finally:
+        _query.reset(token)
+
+
+@contextmanager
+def span(label):
+    # Client-side work shown in the waterfall and the span histogram
+    if not enabled():
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record({
+            "kind": "python", "started": started, "seconds": time.perf_counter() - started,
+            "command": label, "collection": None, "query": _query.get(), "caller": _caller(),
+            "tab": _tab.get(), "rerun": _rerun.get(), "bytes": 0, "ok": True,
+        })
+
+
+def _caller():
+    # "module.function" of the nearest app or faculty frame outside the
+    # query / instrumentation plumbing
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module == "__main__" or (module.startswith("faculty.") and module not in _PLUMBING):
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+_PLUMBING = {__name__, "faculty.db", "faculty.queries", "faculty.parallel"}
+
+
+##############################################
+# Listener
+##############################################
+
+def _collection(event):
+    value = event.command.get(event.command_name)
+    if isinstance(value, str):
+        return value
+    return event.command.get("collection")   # getMore
+
+
+def _reply_bytes(reply):
+    raw = getattr(reply, "raw", None)
+    return len(raw) if raw is not None else len(bson.encode(reply))
+
+
+class CommandRecorder(monitoring.CommandListener):
+
+    def __init__(self):
+        self._pending = {}
+
+    def started(self, event):
+        self._pending[(event.connection_id, event.request_id)] = {
+            "kind": "command", "started": time.perf_counter(),
+            "command": event.command_name, "collection": _collection(event), "query": _query.get(),
+            "caller": _caller(), "tab": _tab.get(), "rerun": _rerun.get(),
+        }
+
+    def succeeded(self, event):
+        self._finish(event, ok=True, nbytes=_reply_bytes(event.reply))
+
+    def failed(self, event):
+        self._finish(event, ok=False, nbytes=0)
+
+    def _finish(self, event, ok, nbytes):
+        entry = self._pending.pop((event.connection_id, event.request_id), None)
+        if entry is not None:
+            entry.update(seconds=event.duration_micros / 1e6, bytes=nbytes, ok=ok)
+            _record(entry)
+
+
+_listener = CommandRecorder()
+
+
+def listeners():
+    # event_listeners for a new MongoClient; starts the exporters once
+    if not enabled():
+        return []
+    start_exporters()
+    return [_listener]
+
+
+def _observe(buckets, seconds):
+    index = bisect_left(DURATION_BUCKETS, seconds)
+    if index < len(buckets):
+        buckets[index] += 1
+
+
+def _record(entry):
+    with _lock:
+        rerun = _reruns.get(entry["rerun"])
+        if rerun is not None and len(rerun["events"]) < MAX_EVENTS_PER_RERUN:
+            rerun["events"].append(entry)
+
+        if entry["kind"] == "command":
+            stats = _commands[(entry["command"], entry["collection"] or "", entry["tab"] or "", entry["query"] or "")]
+            stats["count"] += 1
+            stats["failures"] += not entry["ok"]
+            stats["bytes"] += entry["bytes"]
+        else:
+            stats = _spans[(entry["command"], entry["tab"] or "")]
+            stats["count"] += 1
+        stats["sum"] += entry["seconds"]
+        _observe(stats["buckets"], entry["seconds"])
+
+
+##############################################
+# Waterfall
+##############################################
+
+WATERFALL_COLUMNS = ["start_ms", "duration_ms", "kind", "command", "collection", "query", "caller", "tab",
+                     "reply_kib", "ok"]
+
+
+def rerun_events(rerun_id=None):
+    # (seconds since the rerun began, events) for this script run
+    with _lock:
+        rerun = _reruns.get(rerun_id or _rerun.get())
+        if rerun is None:
+            return 0.0, []
+        return time.perf_counter() - rerun["started"], [
+            dict(e, start_ms=(e["started"] - rerun["started"]) * 1000) for e in rerun["events"]
+        ]
+
+
+def waterfall_frame(events):
+    import pandas as pd
+
+    df = pd.DataFrame(events).reindex(columns=WATERFALL_COLUMNS + ["seconds", "bytes"])
+    df["duration_ms"] = df["seconds"] * 1000
+    df["reply_kib"] = df["bytes"] / 1024
+    return df[WATERFALL_COLUMNS].sort_values("start_ms", kind="stable").reset_index(drop=True).round(2)
+
+
+def debug_sidebar():
+    # Opt-in sidebar view of this rerun's commands and spans
+    if not enabled():
+        return
+    import streamlit as st
+
+    from faculty import charts
+
+    if not st.sidebar.checkbox("🔍 Query waterfall", key="telemetry-waterfall"):
+        return
+    elapsed, events = rerun_events()
+    if not events:
+        st.sidebar.caption("No MongoDB commands in this rerun.")
+        return
+
+    df = waterfall_frame(events)
+    commands = df[df["kind"] == "command"]
+    spans = df[df["kind"] == "python"]
+    st.sidebar.caption(
+        f"{len(commands)} command(s) · {commands['duration_ms'].sum():,.0f} ms in MongoDB · "
+        f"{spans['duration_ms'].sum():,.0f} ms in spans · {elapsed * 1000:,.0f} ms since the rerun began"
+    )
+    # figure_bytes rather than draw, so the view does not record a span of its own
+    st.sidebar.image(charts.figure_bytes(charts.waterfall_chart(df)), use_container_width=True)
+    st.sidebar.dataframe(df, hide_index=True)
+
+
+##############################################
+# Prometheus export
+##############################################
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _histogram(lines, name, stats, labels):
+    cumulative = 0
+    for bound, count in zip(DURATION_BUCKETS, stats["buckets"]):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {stats['count']}")
+    lines.append(f"{name}_sum{_labels(**labels)} {stats['sum']:.6f}")
+    lines.append(f"{name}_count{_labels(**labels)} {stats['count']}")
+
+
+def metrics_text():
+    with _lock:
+        commands = {k: dict(v) for k, v in _commands.items()}
+        spans = {k: dict(v) for k, v in _spans.items()}
+
+    lines = [
+        "# HELP faculty_mongo_commands_total MongoDB commands completed.",
+        "# TYPE faculty_mongo_commands_total counter",
+    ]
+    keyed = [(dict(command=c, collection=coll, tab=tab, query=q), stats)
+             for (c, coll, tab, q), stats in sorted(commands.items())]
+    lines += [f"faculty_mongo_commands_total{_labels(**labels)} {stats['count']}" for labels, stats in keyed]
+    lines += ["# HELP faculty_mongo_command_failures_total MongoDB commands that failed.",
+              "# TYPE faculty_mongo_command_failures_total counter"]
+    lines += [f"faculty_mongo_command_failures_total{_labels(**labels)} {stats['failures']}" for labels, stats in keyed]
+    lines += ["# HELP faculty_mongo_reply_bytes_total Bytes of MongoDB command replies.",
+              "# TYPE faculty_mongo_reply_bytes_total counter"]
+    lines += [f"faculty_mongo_reply_bytes_total{_labels(**labels)} {stats['bytes']}" for labels, stats in keyed]
+
+    lines += ["# HELP faculty_mongo_command_duration_seconds MongoDB command round trip time.",
+              "# TYPE faculty_mongo_command_duration_seconds histogram"]
+    for labels, stats in keyed:
+        _histogram(lines, "faculty_mongo_command_duration_seconds", stats, labels)
+
+    lines += ["# HELP faculty_span_duration_seconds Client-side work recorded with telemetry.span().",
+              "# TYPE faculty_span_duration_seconds histogram"]
+    for (label, tab), stats in sorted(spans.items()):
+        _histogram(lines, "faculty_span_duration_seconds", stats, dict(span=label, tab=tab))
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _write_loop(path, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            with open(path + ".tmp", "w") as f:
+                f.write(metrics_text())
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print("❌ Could not write the metrics file:", e)
+
+
+_exporters_started = False
+
+
+def start_exporters():
+    global _exporters_started
+    with _lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+
+    port = os.getenv("FACULTY_METRICS_PORT")
+    if port:
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", int(port)), _MetricsHandler)
+        except OSError as e:
+            print(f"❌ Could not serve metrics on port {port}:", e)
+        else:
+            threading.Thread(target=server.serve_forever, name="metrics-endpoint", daemon=True).start()
+            print(f"✅ Serving MongoDB command metrics on http://127.0.0.1:{port}/metrics")
+
+    path = os.getenv("FACULTY_METRICS_FILE")
+    if path:
+        interval = float(os.getenv("FACULTY_METRICS_INTERVAL_S", "15"))
+        threading.Thread(target=_write_loop, args=(path, interval), name="metrics-file", daemon=True).start()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+##############################################
+# Overall Trend
+#
+# Compares each student's first and last non-null semester value across a
+# wide (one column per semester) pivot in a single NumPy pass.
+##############################################
+
+NO_TREND = "–"
+IMPROVING = "↑ Improving"
+DECLINING = "↓ Declining"
+STABLE = "→ Stable"
+
+TREND_LABELS = [NO_TREND, IMPROVING, DECLINING, STABLE]
+
+
+def classify_trends(values):
+    # values: 2-D float array, rows = students, columns = semesters in order
+    values = np.asarray(values, dtype=float)
+    n_rows, n_cols = values.shape
+    if n_cols == 0:
+        return pd.Categorical.from_codes(np.zeros(n_rows, dtype=np.int8), categories=TREND_LABELS)
+
+    present = ~np.isnan(values)
+    rows = np.arange(n_rows)
+    first = values[rows, present.argmax(axis=1)]
+    last = values[rows, n_cols - 1 - present[:, ::-1].argmax(axis=1)]
+
+    codes = np.select(
+        [present.sum(axis=1) < 2, last > first, last < first],
+        [0, 1, 2],
+        default=3,
+    ).astype(np.int8)
+    return pd.Categorical.from_codes(codes, categories=TREND_LABELS)
+
+
+def semester_trend_table(df, student_map):
+    # df: enrollment rows with StudentID, SemesterID, Grade
+    # Compute average grade per student per semester
+    avg_per_sem = df.groupby(["StudentID", "SemesterID"])["Grade"].mean().reset_index()
+
+    # Pivot: one row per student, semesters as columns
+    pivot = avg_per_sem.pivot(index="StudentID", columns="SemesterID", values="Grade")
+    semester_cols = list(pivot.columns)
+    pivot = pivot.reset_index()
+
+    # Merge with student names
+    pivot["Name"] = pivot["StudentID"].map(lambda x: student_map.get(x, {}).get("Name", "Unknown"))
+
+    # Compare first vs last semester grade
+    pivot["Overall Trend"] = classify_trends(pivot[semester_cols].to_numpy(dtype=float))
+
+    # Move Name next to StudentID
+    return pivot[["StudentID", "Name"] + semester_cols + ["Overall Trend"]]
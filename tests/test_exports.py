@@ -0,0 +1,35 @@
+from streamlit.testing.v1 import AppTest
+
+
+def paged_export_app():
+    import pandas as pd
+
+    from faculty import exports, paging
+
+    rows = pd.DataFrame({"_id": range(7), "Name": list("abcdefg")})
+
+    def fetch(after, limit):
+        start = 0 if after is None else after + 1
+        page = rows.iloc[start:start + limit] if limit else rows.iloc[start:]
+        last = int(page["_id"].iloc[-1]) if limit and start + limit < len(rows) else None
+        return page.reset_index(drop=True), last
+
+    pager = paging.KeysetPager(fetch, count=lambda: len(rows), size=3)
+    exports.export_button("Download CSV", paging.stream_csv, pager,
+                          file_name="rows.csv", mime="text/csv", source_key=("rows",))
+
+
+def test_paged_export_prepare_then_download():
+    at = AppTest.from_function(paged_export_app).run()
+    assert not at.exception
+    assert [b.label for b in at.button] == ["⚙️ Prepare rows.csv"]
+    assert not at.get("download_button")
+
+    at.button[0].click().run()
+    assert not at.exception
+    assert [b.label for b in at.get("download_button")] == ["Download CSV"]
+
+    # Served once: the next rerun offers a fresh Prepare
+    at.run()
+    assert not at.exception
+    assert not at.get("download_button")
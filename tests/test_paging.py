@@ -0,0 +1,56 @@
+import pandas as pd
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.testing.v1 import AppTest
+
+from faculty import paging
+
+ROWS = pd.DataFrame({"_id": range(7), "Name": list("abcdefg"), "Grade": [70.0, 81.0, None, 90.0, 74.0, 88.0, 65.0]})
+
+
+def paged_table_app():
+    import pandas as pd
+
+    from faculty import exports, paging
+
+    rows = pd.DataFrame({"_id": range(7), "Name": list("abcdefg"),
+                         "Grade": [70.0, 81.0, None, 90.0, 74.0, 88.0, 65.0]})
+
+    def fetch(after, limit):
+        start = 0 if after is None else after + 1
+        page = rows.iloc[start:start + limit] if limit else rows.iloc[start:]
+        last = int(page["_id"].iloc[-1]) if limit and start + limit < len(rows) else None
+        return page.reset_index(drop=True), last
+
+    pager = paging.KeysetPager(fetch, count=lambda: len(rows), size=3)
+    page = paging.paged_table(pager, ("rows",))
+    if page is not None:
+        exports.export_button("Download CSV", paging.stream_csv, pager,
+                              file_name="rows.csv", mime="text/csv", source_key=("rows",))
+
+
+def test_first_page_to_downloaded_csv(monkeypatch):
+    served = {}
+    load = MemoryMediaFileStorage.load_and_get_id
+
+    def record(self, path_or_data, mimetype, kind, filename=None):
+        served[filename] = path_or_data
+        return load(self, path_or_data, mimetype, kind, filename)
+
+    monkeypatch.setattr(MemoryMediaFileStorage, "load_and_get_id", record)
+    # Export pages smaller than the result, so the stream spans several
+    monkeypatch.setattr(paging, "EXPORT_PAGE_SIZE", 2)
+
+    at = AppTest.from_function(paged_table_app).run()
+    assert not at.exception
+    assert at.dataframe[0].value["_id"].tolist() == [0, 1, 2]
+    assert "rows 1–3 · about 7 rows in total" in at.caption[0].value
+
+    at.button(key=next(b.key for b in at.button if b.label == "Next ▶")).click().run()
+    assert not at.exception
+    assert at.dataframe[0].value["_id"].tolist() == [3, 4, 5]
+
+    at.button(key=next(b.key for b in at.button if b.label.startswith("⚙️ Prepare"))).click().run()
+    assert not at.exception
+    assert [b.label for b in at.get("download_button")] == ["Download CSV"]
+    # Every row, not just the page on screen, with one header
+    assert served["rows.csv"] == ROWS.to_csv(index=False).encode("utf-8")